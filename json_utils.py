@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+JSON helpers shared by the Automa export scripts
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data) -> Any:
+    """Decode a CDP frame or JSON document (orjson when available)"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps(obj: Any) -> str:
+    """Encode a CDP message as a text frame (orjson when available)"""
+    return orjson.dumps(obj).decode() if orjson else json.dumps(obj)
+
+def write_json(path: str, data: Any):
+    """Serialize ``data`` as indented JSON and write it with a single call"""
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+def json_size(obj: Any) -> int:
+    """Byte length of the compact UTF-8 JSON form of ``obj``
+
+    orjson and the stdlib fallback give the same count.
+    """
+    if orjson:
+        return len(orjson.dumps(obj))
+    return len(json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
@@ -7,20 +7,258 @@ Automa Workflow Trigger & Log Exporter (Fixed Version)
 - Enhanced workflow analysis and export capabilities
 """
 
-import os
+import sys
 import json
 import csv
 import time
+import argparse
+import functools
+from itertools import chain, islice, repeat
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from automa_csv_exporter import export_workflows_to_csv, export_detailed_workflows_json, analyze_workflow_structure, export_workflow_analysis
+from json_utils import json_dumps, json_loads, json_size, write_json
 
 # Configuration
 CHROME_DEBUG_URL = "http://localhost:9222/json"
 OUTPUT_DIR = "/workspace/exports"
 LOGS_DIR = "/workspace/logs"
+POLL_INTERVAL = 2  # seconds between monitor polls
+MONITOR_EVENT_CAP = 4096  # newest events kept per monitor run
+PUSH_GRACE_PERIOD = 10  # seconds to wait for a storage event before falling back to polling
+MONITOR_EVENT_PREFIX = "__AUTOMA_EVT__"
+LOG_CHUNK_BINDING = "__automaLogChunk"
+LOG_CHUNK_SIZE = 500  # log entries per streamed chunk
+LOG_EXPORT_BATCH = 10000  # log entries converted per batch when writing the CSV
+OUTPUT_BUFFER_SIZE = 1024 * 1024  # write buffer for export files
+LOG_CSV_FIELDS = (
+    'log_id', 'storage_key', 'timestamp', 'workflow_id', 'workflow_name',
+    'status', 'execution_time', 'error_message', 'log_level', 'message',
+    'node_id', 'node_name', 'node_type', 'execution_context', 'data_size',
+    'success_count', 'failure_count', 'trigger_type'
+)
+
+# Steps run by main() for each menu choice
+MENU_ACTIONS = {
+    '1': frozenset({'trigger'}),
+    '2': frozenset({'logs'}),
+    '3': frozenset({'trigger', 'monitor', 'logs'}),
+    '4': frozenset({'logs', 'analysis', 'workflows'}),
+    '5': frozenset({'analysis'}),
+    '6': frozenset({'trigger', 'variables'}),
+}
+
+# Trigger helpers from GitHub issue #1706, installed once per page by bootstrap()
+AUTOMA_HELPERS_SCRIPT = """
+globalThis.__automa = (() => {
+    const getWorkflow = async (id) => {
+        const result = await chrome.storage.local.get('workflows');
+        const workflows = (result.workflows || {});
+        const workflowList = Object.keys(workflows)
+            .filter(workflowId => !workflows[workflowId].invisible)
+            .map(workflowId => workflows[workflowId]);
+        
+        if (id) {
+            return workflowList.find(workflow => workflow.id === id);
+        }
+        return workflowList;
+    };
+    
+    const sendMessage = (event, options, type) => {
+        let message = { 
+            name: type ? type + '--' + event : event, 
+            data: options 
+        };
+        return chrome.runtime.sendMessage(message);
+    };
+    
+    const executeWorkflow = async (id, variables) => {
+        try {
+            const data = { 
+                workflowId: id, 
+                workflowOptions: { data: { variables: variables || {} } } 
+            };
+            
+            const workflow = await getWorkflow(data.workflowId);
+            if (!workflow) {
+                throw new Error(`Can't find workflow with ${data.workflowId} Id`);
+            }
+            
+            const options = data.workflowOptions;
+            const result = await sendMessage('workflow:execute', { ...workflow, options: options }, 'background');
+            
+            return {
+                success: true,
+                message: 'Workflow execution triggered successfully',
+                workflowId: id,
+                workflowName: workflow.name,
+                result: result,
+                timestamp: Date.now()
+            };
+        } catch (error) {
+            return {
+                success: false,
+                error: error.message,
+                workflowId: id
+            };
+        }
+    };
+    
+    // Per-workflow scan offsets into the storage log arrays, used by the monitor
+    const index = {};
+    
+    return { getWorkflow, sendMessage, executeWorkflow, index };
+})();
+true
+"""
+
+# Shared keep-alive session for DevTools HTTP requests
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+def cdp_value(response: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+    """Unpack a Runtime.evaluate/runScript response into ``(value, error)``"""
+    if "error" in response:
+        return None, response["error"].get("message", "CDP error")
+    result = response.get("result", {})
+    details = result.get("exceptionDetails")
+    if details:
+        return None, details.get("exception", {}).get("description") or details.get("text", "Script error")
+    return result.get("result", {}).get("value"), None
+
+class CDPClient:
+    """Persistent Chrome DevTools Protocol connection to a single target
+
+    One WebSocket is opened per run and shared by every CDP call, so each
+    Runtime.evaluate costs a single round-trip instead of a fresh handshake.
+    Messages are tagged with a monotonically increasing id; several requests
+    may be in flight at once and their responses are matched back by id.
+    """
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.ws = websocket.create_connection(ws_url)
+        self.pending: Dict[int, str] = {}
+        self.events = deque(maxlen=10000)
+        self.runtime_enabled = False
+        self._responses: Dict[int, Dict[str, Any]] = {}
+        self._script_ids: Dict[str, str] = {}
+        self._last_id = 0
+
+    def send(self, method: str, params: Dict[str, Any] = None) -> int:
+        """Send a CDP command without waiting for its response"""
+        self._last_id += 1
+        message_id = self._last_id
+        self.ws.send(json_dumps({"id": message_id, "method": method, "params": params or {}}))
+        self.pending[message_id] = method
+        return message_id
+
+    def _receive(self) -> Optional[Dict[str, Any]]:
+        """Read one frame; responses are stored by id and events are returned"""
+        message = json_loads(self.ws.recv())
+        response_id = message.get("id")
+        if response_id is None:
+            return message if "method" in message else None
+        if response_id in self.pending:
+            del self.pending[response_id]
+            self._responses[response_id] = message
+        return None
+
+    def wait(self, message_id: int, on_event: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Block until the response for ``message_id`` arrives
+
+        Events received in the meantime are handed to ``on_event`` if given,
+        otherwise they are queued for next_event().
+        """
+        while message_id not in self._responses:
+            event = self._receive()
+            if event is None:
+                continue
+            if on_event:
+                on_event(event)
+            else:
+                self.events.append(event)
+        return self._responses.pop(message_id)
+
+    def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Return the next CDP event, or None if none arrives within ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        while not self.events:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.ws.settimeout(remaining)
+            try:
+                event = self._receive()
+                if event is not None:
+                    self.events.append(event)
+            except websocket.WebSocketTimeoutException:
+                return None
+            finally:
+                self.ws.settimeout(None)
+        return self.events.popleft()
+
+    def call(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a CDP command and return its response"""
+        return self.wait(self.send(method, params))
+
+    def send_evaluate(self, expression: str, await_promise: bool = True) -> int:
+        """Queue a Runtime.evaluate without waiting for its response"""
+        return self.send("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": await_promise,
+            "returnByValue": True
+        })
+
+    def evaluate(self, expression: str, await_promise: bool = True) -> Dict[str, Any]:
+        """Evaluate a JS expression in the target and return the raw response"""
+        return self.wait(self.send_evaluate(expression, await_promise))
+
+    def enable_runtime(self):
+        """Enable the Runtime domain once for the lifetime of the connection"""
+        if not self.runtime_enabled:
+            self.call("Runtime.enable")
+            self.runtime_enabled = True
+
+    def run_script(self, expression: str, await_promise: bool = True,
+                   on_event: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """Run a static script, compiling it only once per connection
+
+        The compiled scriptId is cached and replayed with Runtime.runScript.
+        A stale id (e.g. after the extension page reloaded) is recompiled once,
+        and scripts that fail to compile fall back to Runtime.evaluate.
+        """
+        self.enable_runtime()
+        for _ in range(2):
+            script_id = self._script_ids.get(expression)
+            if script_id is None:
+                compiled = self.call("Runtime.compileScript", {
+                    "expression": expression,
+                    "sourceURL": "",
+                    "persistScript": True
+                })
+                script_id = compiled.get("result", {}).get("scriptId")
+                if not script_id:
+                    return self.wait(self.send_evaluate(expression, await_promise), on_event)
+                self._script_ids[expression] = script_id
+            response = self.wait(self.send("Runtime.runScript", {
+                "scriptId": script_id,
+                "awaitPromise": await_promise,
+                "returnByValue": True
+            }), on_event)
+            if "error" not in response:
+                return response
+            del self._script_ids[expression]
+        return response
+
+    def close(self):
+        """Close the underlying WebSocket"""
+        self.ws.close()
 
 def print_banner():
     """Print startup banner"""
@@ -37,7 +275,7 @@ def get_chrome_tabs() -> List[Dict]:
     """Get all Chrome tabs"""
     try:
         print("🔍 Connecting to Chrome DevTools...")
-        response = requests.get(CHROME_DEBUG_URL, timeout=10)
+        response = SESSION.get(CHROME_DEBUG_URL, timeout=10)
         if response.status_code == 200:
             tabs = response.json()
             print(f"✅ Found {len(tabs)} Chrome contexts")
@@ -45,7 +283,7 @@ def get_chrome_tabs() -> List[Dict]:
         else:
             print(f"❌ Chrome DevTools error: {response.status_code}")
             return []
-    except requests.exceptions.ConnectError:
+    except requests.exceptions.ConnectionError:
         print("❌ Cannot connect to Chrome - Is it running with --remote-debugging-port=9222?")
         return []
     except Exception as e:
@@ -76,79 +314,119 @@ def find_automa_context() -> Optional[str]:
     print("⚠️ No Automa context found")
     return None
 
-def list_available_workflows(ws_url: str) -> Dict[str, Any]:
-    """List all available workflows"""
+def list_available_workflows(client: CDPClient, pretty: Optional[bool] = None) -> Dict[str, Any]:
+    """List all available workflows, keyed by id
+
+    The workflow table is only printed when ``pretty`` is set, which defaults
+    to whether stdout is a terminal.
+    """
+    if pretty is None:
+        pretty = sys.stdout.isatty()
     print("📋 Fetching available workflows...")
     
     try:
-        ws = websocket.create_connection(ws_url)
-        
         # Get workflows from storage
         get_workflows_script = """
-        new Promise((resolve) => {
-            if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
-                chrome.storage.local.get(['workflows'], (result) => {
-                    const workflows = result.workflows || {};
-                    const workflowList = Object.keys(workflows).map(id => ({
-                        id: id,
-                        name: workflows[id].name || 'Unnamed',
-                        description: workflows[id].description || '',
-                        isDisabled: workflows[id].isDisabled || false,
-                        createdAt: workflows[id].createdAt || 0,
-                        updatedAt: workflows[id].updatedAt || 0
-                    }));
-                    resolve({
-                        success: true,
-                        workflows: workflowList,
-                        count: workflowList.length
-                    });
-                });
-            } else {
-                resolve({success: false, error: 'Storage not available'});
+        (async () => {
+            if (typeof chrome === 'undefined' || !chrome.storage || !chrome.storage.local) {
+                return {success: false, error: 'Storage not available'};
             }
-        })
-        """
-        
-        message = {
-            "id": 1,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": get_workflows_script,
-                "awaitPromise": True,
-                "returnByValue": True
+            const result = await chrome.storage.local.get(['workflows']);
+            const workflows = result.workflows || {};
+            const workflowsById = {};
+            for (const id of Object.keys(workflows)) {
+                workflowsById[id] = {
+                    id: id,
+                    name: workflows[id].name || 'Unnamed',
+                    description: workflows[id].description || '',
+                    isDisabled: workflows[id].isDisabled || false,
+                    createdAt: workflows[id].createdAt || 0,
+                    updatedAt: workflows[id].updatedAt || 0
+                };
             }
-        }
+            return {
+                success: true,
+                workflows: workflowsById,
+                count: Object.keys(workflowsById).length
+            };
+        })()
+        """
         
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
-        ws.close()
+        result_data, error = cdp_value(client.run_script(get_workflows_script))
         
-        if "result" in response and "result" in response["result"]:
-            result_data = response["result"]["result"]["value"]
+        if result_data:
             if result_data.get("success"):
-                workflows = result_data.get("workflows", [])
+                workflows = result_data.get("workflows", {})
                 print(f"✅ Found {len(workflows)} workflows")
                 
                 # Display workflow list
-                print("\n📋 Available Workflows:")
-                for i, workflow in enumerate(workflows, 1):
-                    status = "🔴 Disabled" if workflow.get("isDisabled") else "🟢 Enabled"
-                    print(f"  {i}. {workflow['name']} ({workflow['id'][:8]}...) - {status}")
-                    if workflow.get("description"):
-                        print(f"     📝 {workflow['description'][:60]}...")
+                if pretty:
+                    print("\n📋 Available Workflows:")
+                    for i, workflow in enumerate(workflows.values(), 1):
+                        status = "🔴 Disabled" if workflow.get("isDisabled") else "🟢 Enabled"
+                        print(f"  {i}. {workflow['name']} ({workflow['id'][:8]}...) - {status}")
+                        if workflow.get("description"):
+                            print(f"     📝 {workflow['description'][:60]}...")
                 
-                return {wf['id']: wf for wf in workflows}
+                return workflows
             else:
                 print(f"❌ Failed to get workflows: {result_data.get('error')}")
                 return {}
         else:
-            print("❌ Invalid response")
+            print(f"❌ Invalid response: {error}")
             return {}
             
     except Exception as e:
         print(f"❌ Error fetching workflows: {e}")
         return {}
-def trigger_workflow_fixed(ws_url: str, workflow_id: str, workflow_name: str = "", variables: Dict = None) -> bool:
+def bootstrap(client: CDPClient) -> bool:
+    """Install the Automa trigger helpers on the extension page"""
+    try:
+        _, error = cdp_value(client.evaluate(AUTOMA_HELPERS_SCRIPT, await_promise=False))
+        if error:
+            print(f"❌ Failed to install Automa helpers: {error}")
+            return False
+        return True
+    except Exception as e:
+        print(f"❌ Error installing Automa helpers: {e}")
+        return False
+
+def _trigger_script(workflow_id: str, variables: Dict = None) -> str:
+    """Build the expression that runs one workflow through the installed helpers"""
+    # Values are embedded as JSON literals so quotes in ids cannot break the script
+    variables_json = json.dumps(variables or {})
+    workflow_literal = json_dumps(workflow_id)
+    return f"""
+    (async () => {{
+        if (!globalThis.__automa) {{
+            return {{ success: false, error: 'Automa helpers not installed', helpersMissing: true }};
+        }}
+        try {{
+            return await globalThis.__automa.executeWorkflow({workflow_literal}, {variables_json});
+        }} catch (error) {{
+            return {{ success: false, error: error.message, workflowId: {workflow_literal} }};
+        }}
+    }})()
+    """
+
+def _report_trigger(result_data: Any, error: Optional[str], workflow_id: str, workflow_name: str = "") -> bool:
+    """Print the outcome of a trigger call and return whether it succeeded"""
+    if result_data:
+        if result_data.get("success"):
+            print(f"✅ Workflow triggered successfully!")
+            print(f"   📋 Workflow: {result_data.get('workflowName', workflow_name)}")
+            print(f"   🆔 ID: {result_data.get('workflowId', workflow_id)}")
+            print(f"   ⏰ Timestamp: {datetime.fromtimestamp(result_data.get('timestamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}")
+            return True
+        else:
+            error_msg = result_data.get('error', 'Unknown error')
+            print(f"❌ Failed to trigger workflow: {error_msg}")
+            return False
+    else:
+        print(f"❌ Invalid trigger response: {error}")
+        return False
+
+def trigger_workflow_fixed(client: CDPClient, workflow_id: str, workflow_name: str = "", variables: Dict = None) -> bool:
     """
     Trigger workflow using the fixed method from GitHub issue #1706
     This uses the proper Chrome extension messaging system
@@ -158,223 +436,203 @@ def trigger_workflow_fixed(ws_url: str, workflow_id: str, workflow_name: str = "
         print(f"📝 With variables: {variables}")
     
     try:
-        ws = websocket.create_connection(ws_url)
-        
-        # Fixed trigger script based on GitHub issue solution
-        variables_json = json.dumps(variables or {})
-        trigger_script = f"""
-        new Promise(async (resolve) => {{
-            try {{
-                // Helper functions from the GitHub issue solution
-                const getWorkflow = async (id) => {{
-                    const result = await chrome.storage.local.get('workflows');
-                    const workflows = (result.workflows || {{}});
-                    const workflowList = Object.keys(workflows)
-                        .filter(workflowId => !workflows[workflowId].invisible)
-                        .map(workflowId => workflows[workflowId]);
-                    
-                    if (id) {{
-                        return workflowList.find(workflow => workflow.id === id);
-                    }}
-                    return workflowList;
-                }};
-                
-                const sendMessage = (event, options, type) => {{
-                    let message = {{ 
-                        name: type ? type + '--' + event : event, 
-                        data: options 
-                    }};
-                    return chrome.runtime.sendMessage(message);
-                }};
-                
-                // Main execution function (from GitHub issue solution)
-                const executeWorkflow = async (id, variables) => {{
-                    try {{
-                        const data = {{ 
-                            workflowId: id, 
-                            workflowOptions: {{ data: {{ variables: variables || {{}} }} }} 
-                        }};
-                        
-                        const workflow = await getWorkflow(data.workflowId);
-                        if (!workflow) {{
-                            throw new Error(`Can't find workflow with ${{data.workflowId}} Id`);
-                        }}
-                        
-                        const options = data.workflowOptions;
-                        const result = await sendMessage('workflow:execute', {{ ...workflow, options: options }}, 'background');
-                        
-                        return {{
-                            success: true,
-                            message: 'Workflow execution triggered successfully',
-                            workflowId: id,
-                            workflowName: workflow.name,
-                            result: result,
-                            timestamp: Date.now()
-                        }};
-                    }} catch (error) {{
-                        return {{
-                            success: false,
-                            error: error.message,
-                            workflowId: id
-                        }};
-                    }}
-                }};
-                
-                // Execute the workflow
-                const variables = {variables_json};
-                const result = await executeWorkflow('{workflow_id}', variables);
-                resolve(result);
-                
-            }} catch (error) {{
-                resolve({{
-                    success: false,
-                    error: error.message,
-                    workflowId: '{workflow_id}'
-                }});
-            }}
-        }})
-        """
-        
-        message = {
-            "id": 2,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": trigger_script,
-                "awaitPromise": True,
-                "returnByValue": True
-            }
-        }
-        
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
-        ws.close()
+        trigger_script = _trigger_script(workflow_id, variables)
+        result_data, error = cdp_value(client.evaluate(trigger_script))
+        # The extension page may have reloaded since bootstrap(); reinstall once
+        if result_data and result_data.get("helpersMissing") and bootstrap(client):
+            result_data, error = cdp_value(client.evaluate(trigger_script))
         
-        if "result" in response and "result" in response["result"]:
-            result_data = response["result"]["result"]["value"]
-            if result_data.get("success"):
-                print(f"✅ Workflow triggered successfully!")
-                print(f"   📋 Workflow: {result_data.get('workflowName', workflow_name)}")
-                print(f"   🆔 ID: {result_data.get('workflowId', workflow_id)}")
-                print(f"   ⏰ Timestamp: {datetime.fromtimestamp(result_data.get('timestamp', 0) / 1000).strftime('%Y-%m-%d %H:%M:%S')}")
-                return True
-            else:
-                error_msg = result_data.get('error', 'Unknown error')
-                print(f"❌ Failed to trigger workflow: {error_msg}")
-                return False
-        else:
-            print("❌ Invalid trigger response")
-            return False
+        return _report_trigger(result_data, error, workflow_id, workflow_name)
             
     except Exception as e:
         print(f"❌ Error triggering workflow: {e}")
         return False
 
-def export_workflow_logs(ws_url: str) -> Dict[str, Any]:
-    """Export workflow execution logs from Automa's storage (enhanced version)"""
-    print("📤 Extracting workflow execution logs...")
+def trigger_workflows(client: CDPClient, workflow_ids: List[str], variables: Dict = None) -> Dict[str, bool]:
+    """Trigger several workflows at once over the shared connection
+
+    Every Runtime.evaluate is sent before any response is awaited, so the
+    extension starts all workflows concurrently; responses are matched by id.
+    """
+    workflow_ids = list(dict.fromkeys(workflow_ids))
+    print(f"🚀 Triggering {len(workflow_ids)} workflows (FIXED METHOD)")
+    if variables:
+        print(f"📝 With variables: {variables}")
     
+    results = {}
     try:
-        ws = websocket.create_connection(ws_url)
+        pending = {workflow_id: client.send_evaluate(_trigger_script(workflow_id, variables))
+                   for workflow_id in workflow_ids}
+        responses = {workflow_id: cdp_value(client.wait(message_id)) for workflow_id, message_id in pending.items()}
+        
+        # The extension page may have reloaded since bootstrap(); reinstall once
+        missing = [workflow_id for workflow_id, (result_data, _) in responses.items()
+                   if result_data and result_data.get("helpersMissing")]
+        if missing and bootstrap(client):
+            pending = {workflow_id: client.send_evaluate(_trigger_script(workflow_id, variables))
+                       for workflow_id in missing}
+            responses.update((workflow_id, cdp_value(client.wait(message_id))) for workflow_id, message_id in pending.items())
         
+        for workflow_id, (result_data, error) in responses.items():
+            results[workflow_id] = _report_trigger(result_data, error, workflow_id)
+    except Exception as e:
+        print(f"❌ Error triggering workflows: {e}")
+        for workflow_id in workflow_ids:
+            results.setdefault(workflow_id, False)
+    
+    print(f"📊 Triggered {sum(results.values())}/{len(results)} workflows")
+    return results
+
+def _collect_log_chunk(logs: Dict[str, Any], event: Dict[str, Any]):
+    """Merge a log chunk streamed through the log binding into ``logs``"""
+    if event.get("method") != "Runtime.bindingCalled":
+        return
+    params = event.get("params", {})
+    if params.get("name") != LOG_CHUNK_BINDING:
+        return
+    chunk = json_loads(params.get("payload", "{}"))
+    if "entries" in chunk:
+        logs.setdefault(chunk["key"], []).extend(chunk["entries"])
+    else:
+        logs.setdefault(chunk["key"], {}).update(chunk.get("items", {}))
+
+def export_workflow_logs(client: CDPClient, include_sizes: bool = False) -> Dict[str, Any]:
+    """Export workflow execution logs from Automa's storage (enhanced version)
+
+    Log stores are streamed back in LOG_CHUNK_SIZE pieces through a
+    Runtime.addBinding channel so no single CDP frame carries the whole
+    store; the evaluate result itself only holds totals and execution data.
+    With ``include_sizes`` the serialized size of every entry is measured in
+    the extension and returned under ``entrySizes``.
+    """
+    print("📤 Extracting workflow execution logs...")
+    
+    try:
         # Enhanced logs extraction script
         logs_extraction_script = """
-        new Promise((resolve) => {
-            if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
-                // Comprehensive list of potential log storage keys
-                const logKeys = [
-                    'workflowLogs',
-                    'executionLogs', 
-                    'logs',
-                    'workflowHistory',
-                    'execution-history',
-                    'automation-logs',
-                    'workflow-executions',
-                    'debugLogs',
-                    'errorLogs',
-                    'workflow-results'
-                ];
-                
-                chrome.storage.local.get(logKeys, (result) => {
-                    const logs = {};
-                    let totalLogs = 0;
-                    
-                    // Collect logs from all possible storage keys
-                    logKeys.forEach(key => {
-                        if (result[key]) {
-                            logs[key] = result[key];
-                            if (Array.isArray(result[key])) {
-                                totalLogs += result[key].length;
-                            } else if (typeof result[key] === 'object') {
-                                totalLogs += Object.keys(result[key]).length;
-                            }
-                        }
-                    });
-                    
-                    // Get execution data from workflows
-                    chrome.storage.local.get(['workflows'], (workflowResult) => {
-                        const workflows = workflowResult.workflows || {};
-                        const executionData = [];
-                        
-                        Object.keys(workflows).forEach(workflowId => {
-                            const workflow = workflows[workflowId];
-                            const executionInfo = {
-                                workflowId: workflowId,
-                                workflowName: workflow.name || 'Unnamed',
-                                lastExecution: workflow.lastExecution || null,
-                                executionHistory: workflow.executionHistory || null,
-                                executionCount: workflow.executionCount || 0,
-                                totalExecutionTime: workflow.totalExecutionTime || 0,
-                                avgExecutionTime: workflow.avgExecutionTime || 0,
-                                lastError: workflow.lastError || null,
-                                successRate: workflow.successRate || null
-                            };
-                            
-                            if (executionInfo.lastExecution || executionInfo.executionHistory) {
-                                executionData.push(executionInfo);
-                            }
-                        });
-                        
-                        resolve({
-                            success: true,
-                            logs: logs,
-                            executionData: executionData,
-                            totalLogs: totalLogs,
-                            timestamp: Date.now(),
-                            storageKeys: Object.keys(logs),
-                            workflowsWithExecutionData: executionData.length
-                        });
-                    });
-                });
-            } else {
-                resolve({
+        (async (bindingName, chunkSize, withSizes) => {
+            if (typeof chrome === 'undefined' || !chrome.storage || !chrome.storage.local) {
+                return {
                     success: false,
                     error: 'Chrome storage not available'
-                });
+                };
             }
-        })
+            
+            // Comprehensive list of potential log storage keys
+            const logKeys = [
+                'workflowLogs',
+                'executionLogs', 
+                'logs',
+                'workflowHistory',
+                'execution-history',
+                'automation-logs',
+                'workflow-executions',
+                'debugLogs',
+                'errorLogs',
+                'workflow-results'
+            ];
+            
+            // Read the log keys and workflows in a single storage round-trip
+            const result = await chrome.storage.local.get([...logKeys, 'workflows']);
+            const emit = typeof globalThis[bindingName] === 'function' ? globalThis[bindingName] : null;
+            // UTF-8 bytes, matching json_size() on the Python side
+            const encoder = new TextEncoder();
+            const sizeOf = entry => encoder.encode(JSON.stringify(entry)).length;
+            const entrySizes = withSizes ? {} : null;
+            const logs = {};
+            let totalLogs = 0;
+            
+            // Collect logs from all possible storage keys, streaming object
+            // stores through the binding when it is available
+            logKeys.forEach(key => {
+                const value = result[key];
+                if (!value) {
+                    return;
+                }
+                if (Array.isArray(value)) {
+                    totalLogs += value.length;
+                    if (entrySizes) entrySizes[key] = value.map(sizeOf);
+                } else if (typeof value === 'object') {
+                    totalLogs += Object.keys(value).length;
+                    if (entrySizes) {
+                        entrySizes[key] = Object.fromEntries(Object.entries(value).map(([id, entry]) => [id, sizeOf(entry)]));
+                    }
+                }
+                if (!emit || typeof value !== 'object') {
+                    logs[key] = value;
+                } else if (Array.isArray(value)) {
+                    for (let i = 0; i === 0 || i < value.length; i += chunkSize) {
+                        emit(JSON.stringify({key: key, entries: value.slice(i, i + chunkSize)}));
+                    }
+                } else {
+                    const items = Object.entries(value);
+                    for (let i = 0; i === 0 || i < items.length; i += chunkSize) {
+                        emit(JSON.stringify({key: key, items: Object.fromEntries(items.slice(i, i + chunkSize))}));
+                    }
+                }
+            });
+            
+            // Get execution data from workflows
+            const workflows = result.workflows || {};
+            const executionData = [];
+            
+            Object.keys(workflows).forEach(workflowId => {
+                const workflow = workflows[workflowId];
+                const executionInfo = {
+                    workflowId: workflowId,
+                    workflowName: workflow.name || 'Unnamed',
+                    lastExecution: workflow.lastExecution || null,
+                    executionHistory: workflow.executionHistory || null,
+                    executionCount: workflow.executionCount || 0,
+                    totalExecutionTime: workflow.totalExecutionTime || 0,
+                    avgExecutionTime: workflow.avgExecutionTime || 0,
+                    lastError: workflow.lastError || null,
+                    successRate: workflow.successRate || null
+                };
+                
+                if (executionInfo.lastExecution || executionInfo.executionHistory) {
+                    executionData.push(executionInfo);
+                }
+            });
+            
+            return {
+                success: true,
+                logs: logs,
+                executionData: executionData,
+                totalLogs: totalLogs,
+                timestamp: Date.now(),
+                storageKeys: logKeys.filter(key => result[key]),
+                entrySizes: entrySizes,
+                workflowsWithExecutionData: executionData.length
+            };
+        })""" + f"""({json_dumps(LOG_CHUNK_BINDING)}, {LOG_CHUNK_SIZE}, {json_dumps(include_sizes)})
         """
         
-        message = {
-            "id": 3,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": logs_extraction_script,
-                "awaitPromise": True,
-                "returnByValue": True
-            }
-        }
-        
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
-        ws.close()
+        streamed_logs = {}
+        client.enable_runtime()
+        client.call("Runtime.addBinding", {"name": LOG_CHUNK_BINDING})
+        try:
+            response = client.run_script(
+                logs_extraction_script,
+                on_event=lambda event: _collect_log_chunk(streamed_logs, event)
+            )
+        finally:
+            client.call("Runtime.removeBinding", {"name": LOG_CHUNK_BINDING})
         
-        if "result" in response and "result" in response["result"]:
-            result_data = response["result"]["result"]["value"]
+        result_data, error = cdp_value(response)
+        if result_data:
             if result_data.get("success"):
                 total_logs = result_data.get("totalLogs", 0)
                 storage_keys = result_data.get("storageKeys", [])
                 execution_workflows = result_data.get("workflowsWithExecutionData", 0)
                 
+                # Reassemble streamed stores in storage key order
+                inline_logs = result_data.get("logs", {})
+                result_data["logs"] = {
+                    key: streamed_logs[key] if key in streamed_logs else inline_logs.get(key)
+                    for key in storage_keys
+                }
+                
                 print(f"✅ Extracted {total_logs} log entries from {len(storage_keys)} storage locations")
                 print(f"📊 Found execution data for {execution_workflows} workflows")
                 if storage_keys:
@@ -385,129 +643,126 @@ def export_workflow_logs(ws_url: str) -> Dict[str, Any]:
                 print(f"❌ Log extraction failed: {result_data.get('error')}")
                 return {}
         else:
-            print("❌ Invalid logs response")
+            print(f"❌ Invalid logs response: {error}")
             return {}
             
     except Exception as e:
         print(f"❌ Error extracting logs: {e}")
         return {}
 
-def export_logs_to_csv(logs_data: Dict[str, Any], output_path: str) -> bool:
-    """Export logs to CSV format (enhanced version)"""
+@functools.lru_cache(maxsize=4096)
+def _format_epoch_seconds(seconds: int) -> str:
+    """Format whole epoch seconds as local time (cached, logs cluster per second)"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds))
+
+def _format_timestamp(value: Any) -> Any:
+    """Format a millisecond epoch timestamp, leaving other values untouched"""
+    # Decoded JSON timestamps are usually ints already; only strings need parsing
+    if isinstance(value, int) and not isinstance(value, bool):
+        return _format_epoch_seconds(value // 1000) if value > 0 else value
+    if isinstance(value, str) and value.isdigit():
+        return _format_epoch_seconds(int(value) // 1000)
+    return value
+
+# Entry fields and their CSV defaults, in LOG_CSV_FIELDS order (timestamp
+# first, data_size omitted)
+_LOG_ENTRY_FIELDS = (
+    ('timestamp', ''), ('workflowId', ''), ('workflowName', ''), ('status', ''),
+    ('executionTime', ''), ('error', ''), ('level', 'info'), ('message', ''),
+    ('nodeId', ''), ('nodeName', ''), ('nodeType', ''), ('executionContext', ''),
+    ('successCount', ''), ('failureCount', ''), ('triggerType', '')
+)
+
+def _iter_log_rows(storage_key: str, log_entries: Any, sizes: Any = None, include_size: bool = False):
+    """Yield CSV rows (tuples in LOG_CSV_FIELDS order) for one log store
+
+    List stores get ``<storage_key>_<index>`` ids, dict stores keep their keys.
+    Entries are converted column by column in batches of LOG_EXPORT_BATCH and
+    zipped back into rows, so each field is pulled in one tight loop.
+    """
+    if isinstance(log_entries, list):
+        items = ((f"{storage_key}_{i}", i, entry) for i, entry in enumerate(log_entries))
+    elif isinstance(log_entries, dict):
+        items = ((entry_id, entry_id, entry) for entry_id, entry in log_entries.items())
+    else:
+        return
+    items = (item for item in items if isinstance(item[2], dict))
+    
+    while True:
+        batch = list(islice(items, LOG_EXPORT_BATCH))
+        if not batch:
+            return
+        log_ids, size_keys, entries = zip(*batch)
+        columns = [[entry.get(field, default) for entry in entries] for field, default in _LOG_ENTRY_FIELDS]
+        if include_size:
+            data_sizes = [sizes[key] for key in size_keys] if sizes else map(json_size, entries)
+        else:
+            data_sizes = repeat('')
+        yield from zip(
+            log_ids, repeat(storage_key), map(_format_timestamp, columns[0]),
+            *columns[1:12], data_sizes, *columns[12:]
+        )
+
+def _iter_execution_rows(execution_data: List[Dict], include_size: bool = False):
+    """Yield CSV rows for the lastExecution record of each workflow"""
+    for exec_data in execution_data:
+        if exec_data.get('lastExecution'):
+            last_exec = exec_data['lastExecution']
+            yield (
+                f"exec_{exec_data['workflowId']}",
+                'workflow_execution',
+                _format_timestamp(last_exec.get('timestamp', '')),
+                exec_data['workflowId'],
+                exec_data['workflowName'],
+                last_exec.get('status', ''),
+                last_exec.get('executionTime', ''),
+                last_exec.get('error', ''),
+                'execution',
+                f"Workflow execution: {last_exec.get('status', 'unknown')}",
+                '',
+                '',
+                '',
+                'workflow',
+                json_size(last_exec) if include_size else '',
+                exec_data.get('executionCount', ''),
+                '',
+                last_exec.get('triggerType', 'manual')
+            )
+
+def export_logs_to_csv(logs_data: Dict[str, Any], output_path: str, include_size: bool = False) -> bool:
+    """Export logs to CSV format (enhanced version)
+
+    Rows are streamed straight to disk with ``csv.writer`` instead of being
+    collected as dicts first. The ``data_size`` column is only filled in when
+    ``include_size`` is set; sizes measured by the extension (``entrySizes``)
+    are used when present so entries are not serialized a second time.
+    """
     print(f"💾 Exporting logs to CSV: {output_path}")
     
     try:
-        csv_rows = []
-        
-        # Process different types of log data
         logs = logs_data.get("logs", {})
-        execution_data = logs_data.get("executionData", [])
-        
-        # Process stored logs
-        for storage_key, log_entries in logs.items():
-            if isinstance(log_entries, list):
-                for i, entry in enumerate(log_entries):
-                    if isinstance(entry, dict):
-                        row = {
-                            'log_id': f"{storage_key}_{i}",
-                            'storage_key': storage_key,
-                            'timestamp': entry.get('timestamp', ''),
-                            'workflow_id': entry.get('workflowId', ''),
-                            'workflow_name': entry.get('workflowName', ''),
-                            'status': entry.get('status', ''),
-                            'execution_time': entry.get('executionTime', ''),
-                            'error_message': entry.get('error', ''),
-                            'log_level': entry.get('level', 'info'),
-                            'message': entry.get('message', ''),
-                            'node_id': entry.get('nodeId', ''),
-                            'node_name': entry.get('nodeName', ''),
-                            'node_type': entry.get('nodeType', ''),
-                            'execution_context': entry.get('executionContext', ''),
-                            'data_size': len(json.dumps(entry)) if entry else 0,
-                            'success_count': entry.get('successCount', ''),
-                            'failure_count': entry.get('failureCount', ''),
-                            'trigger_type': entry.get('triggerType', '')
-                        }
-                        
-                        # Convert timestamp if numeric
-                        if row['timestamp'] and str(row['timestamp']).isdigit():
-                            ts = int(row['timestamp']) / 1000
-                            row['timestamp'] = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        csv_rows.append(row)
-            
-            elif isinstance(log_entries, dict):
-                for entry_id, entry in log_entries.items():
-                    if isinstance(entry, dict):
-                        row = {
-                            'log_id': entry_id,
-                            'storage_key': storage_key,
-                            'timestamp': entry.get('timestamp', ''),
-                            'workflow_id': entry.get('workflowId', ''),
-                            'workflow_name': entry.get('workflowName', ''),
-                            'status': entry.get('status', ''),
-                            'execution_time': entry.get('executionTime', ''),
-                            'error_message': entry.get('error', ''),
-                            'log_level': entry.get('level', 'info'),
-                            'message': entry.get('message', ''),
-                            'node_id': entry.get('nodeId', ''),
-                            'node_name': entry.get('nodeName', ''),
-                            'node_type': entry.get('nodeType', ''),
-                            'execution_context': entry.get('executionContext', ''),
-                            'data_size': len(json.dumps(entry)),
-                            'success_count': entry.get('successCount', ''),
-                            'failure_count': entry.get('failureCount', ''),
-                            'trigger_type': entry.get('triggerType', '')
-                        }
-                        csv_rows.append(row)
-        
-        # Process execution data from workflows
-        for exec_data in execution_data:
-            if exec_data.get('lastExecution'):
-                last_exec = exec_data['lastExecution']
-                row = {
-                    'log_id': f"exec_{exec_data['workflowId']}",
-                    'storage_key': 'workflow_execution',
-                    'timestamp': last_exec.get('timestamp', ''),
-                    'workflow_id': exec_data['workflowId'],
-                    'workflow_name': exec_data['workflowName'],
-                    'status': last_exec.get('status', ''),
-                    'execution_time': last_exec.get('executionTime', ''),
-                    'error_message': last_exec.get('error', ''),
-                    'log_level': 'execution',
-                    'message': f"Workflow execution: {last_exec.get('status', 'unknown')}",
-                    'node_id': '',
-                    'node_name': '',
-                    'node_type': '',
-                    'execution_context': 'workflow',
-                    'data_size': len(json.dumps(last_exec)),
-                    'success_count': exec_data.get('executionCount', ''),
-                    'failure_count': '',
-                    'trigger_type': last_exec.get('triggerType', 'manual')
-                }
-                
-                # Convert timestamp if numeric
-                if row['timestamp'] and str(row['timestamp']).isdigit():
-                    ts = int(row['timestamp']) / 1000
-                    row['timestamp'] = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
-                
-                csv_rows.append(row)
+        entry_sizes = logs_data.get("entrySizes") or {}
+        rows = chain(
+            chain.from_iterable(
+                _iter_log_rows(storage_key, log_entries, entry_sizes.get(storage_key), include_size)
+                for storage_key, log_entries in logs.items()
+            ),
+            _iter_execution_rows(logs_data.get("executionData", []), include_size)
+        )
+        first_row = next(rows, None)
         
         # Write CSV
-        if csv_rows:
-            fieldnames = [
-                'log_id', 'storage_key', 'timestamp', 'workflow_id', 'workflow_name',
-                'status', 'execution_time', 'error_message', 'log_level', 'message',
-                'node_id', 'node_name', 'node_type', 'execution_context', 'data_size',
-                'success_count', 'failure_count', 'trigger_type'
-            ]
+        if first_row is not None:
+            row_count = 1
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(LOG_CSV_FIELDS)
+                writer.writerow(first_row)
+                for row in rows:
+                    writer.writerow(row)
+                    row_count += 1
             
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(csv_rows)
-            
-            print(f"✅ Exported {len(csv_rows)} log entries to CSV")
+            print(f"✅ Exported {row_count} log entries to CSV")
             return True
         else:
             print("❌ No log data to export")
@@ -517,13 +772,13 @@ def export_logs_to_csv(logs_data: Dict[str, Any], output_path: str) -> bool:
         print(f"❌ CSV export failed: {e}")
         return False
 
-def export_logs_json(logs_data: Dict[str, Any], output_path: str) -> bool:
+def export_logs_json(logs_data: Dict[str, Any], output_path: str, exported_at: Optional[datetime] = None) -> bool:
     """Export complete logs as JSON (enhanced version)"""
     print(f"💾 Exporting detailed logs to JSON: {output_path}")
     
     try:
         export_data = {
-            'export_timestamp': datetime.now().isoformat(),
+            'export_timestamp': (exported_at or datetime.now()).isoformat(),
             'export_version': '2.0',
             'total_logs': logs_data.get('totalLogs', 0),
             'storage_keys': logs_data.get('storageKeys', []),
@@ -537,8 +792,7 @@ def export_logs_json(logs_data: Dict[str, Any], output_path: str) -> bool:
             }
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        write_json(output_path, export_data)
         
         print("✅ JSON logs exported successfully")
         return True
@@ -546,17 +800,85 @@ def export_logs_json(logs_data: Dict[str, Any], output_path: str) -> bool:
         print(f"❌ JSON export failed: {e}")
         return False
 
-def monitor_workflow_execution(ws_url: str, workflow_id: str, timeout: int = 60) -> Dict[str, Any]:
-    """Monitor workflow execution in real-time (enhanced version)"""
+def _record_monitor_logs(monitoring_results: Dict[str, Any], seen_events: OrderedDict, logs: List[Dict],
+                         verbose: bool = True):
+    """Append logs not seen before to the monitoring results and print them
+
+    Per-event lines are only formatted and printed when ``verbose`` is set.
+    ``seen_events`` remembers the newest MONITOR_EVENT_CAP event keys.
+    """
+    metrics = monitoring_results['performance_metrics']
+    events = monitoring_results['execution_events']
+    for log in logs:
+        timestamp = log.get('timestamp')
+        event_key = (log.get('timestamp'), log.get('nodeId'), log.get('message'))
+        if event_key in seen_events:
+            continue
+        seen_events[event_key] = None
+        if len(seen_events) > MONITOR_EVENT_CAP:
+            seen_events.popitem(last=False)
+        if len(events) == events.maxlen:
+            monitoring_results['dropped_events'] += 1
+        events.append(log)
+        if log.get('nodeId'):
+            metrics['nodes_executed'] += 1
+        if log.get('level') == 'error' or log.get('status') == 'error':
+            metrics['errors_encountered'] += 1
+        
+        # Create timeline entry
+        timeline_entry = {
+            'timestamp': log.get('timestamp'),
+            'event': log.get('message', 'Execution event'),
+            'status': log.get('status', 'running'),
+            'node_id': log.get('nodeId', ''),
+            'node_name': log.get('nodeName', ''),
+            'execution_time': log.get('executionTime', 0)
+        }
+        monitoring_results['execution_timeline'].append(timeline_entry)
+        
+        if not verbose:
+            continue
+        
+        # Display progress
+        timestamp_str = ""
+        if isinstance(timestamp, int) and not isinstance(timestamp, bool) and timestamp > 0:
+            timestamp_str = _format_epoch_seconds(timestamp // 1000)[11:]
+        
+        node_info = ""
+        if log.get('nodeId'):
+            node_info = f" [{log.get('nodeName', log.get('nodeId', '')[:8])}]"
+        
+        print(f"📝 {timestamp_str} {log.get('message', 'Event')}{node_info} - {log.get('status', 'running')}")
+
+def _finished_status(status: Optional[str], current_exec: Optional[Dict]) -> Optional[str]:
+    """Return the terminal workflow status, or None while it is still running"""
+    if status in ['completed', 'failed', 'stopped', 'finished', 'error']:
+        return status
+    if current_exec and current_exec.get('status') in ['completed', 'failed', 'stopped']:
+        return current_exec.get('status')
+    return None
+
+def monitor_workflow_execution(client: CDPClient, workflow_id: str, timeout: int = 60,
+                               verbose: bool = True) -> Dict[str, Any]:
+    """Monitor workflow execution in real-time (enhanced version)
+
+    A chrome.storage.onChanged listener is installed in the extension and
+    reports matching log/status changes through console.log, which arrive as
+    Runtime.consoleAPICalled events. If nothing is pushed within
+    PUSH_GRACE_PERIOD the monitor falls back to polling storage.
+    """
     print(f"👁️ Monitoring workflow execution for {timeout} seconds...")
     
     start_time = time.time()
+    started = time.monotonic()
+    deadline = started + timeout
     monitoring_results = {
-        'started_at': datetime.now().isoformat(),
+        'started_at': datetime.fromtimestamp(start_time).isoformat(),
         'workflow_id': workflow_id,
-        'execution_events': [],
+        'execution_events': deque(maxlen=MONITOR_EVENT_CAP),
+        'dropped_events': 0,
         'final_status': 'unknown',
-        'execution_timeline': [],
+        'execution_timeline': deque(maxlen=MONITOR_EVENT_CAP),
         'performance_metrics': {
             'total_execution_time': 0,
             'nodes_executed': 0,
@@ -566,125 +888,166 @@ def monitor_workflow_execution(ws_url: str, workflow_id: str, timeout: int = 60)
     }
     
     try:
-        ws = websocket.create_connection(ws_url)
-        
-        last_log_count = 0
-        
-        while (time.time() - start_time) < timeout:
-            # Enhanced status checking script
-            status_script = f"""
-            new Promise((resolve) => {{
-                if (typeof chrome !== 'undefined' && chrome.storage) {{
-                    chrome.storage.local.get(['workflowLogs', 'workflows', 'executionLogs'], (result) => {{
-                        const logs = result.workflowLogs || [];
-                        const execLogs = result.executionLogs || [];
-                        const workflows = result.workflows || {{}};
-                        const workflow = workflows['{workflow_id}'];
-                        
-                        // Find recent logs for this workflow
-                        const startTime = {int((start_time - 5) * 1000)};
-                        const recentLogs = [...logs, ...execLogs].filter(log => 
-                            log.workflowId === '{workflow_id}' && 
-                            log.timestamp > startTime
-                        );
-                        
-                        // Sort by timestamp
-                        recentLogs.sort((a, b) => (a.timestamp || 0) - (b.timestamp || 0));
-                        
-                        // Calculate performance metrics
-                        const nodeExecutions = recentLogs.filter(log => log.nodeId);
-                        const errors = recentLogs.filter(log => log.level === 'error' || log.status === 'error');
-                        
-                        resolve({{
-                            recentLogs: recentLogs,
-                            workflowStatus: workflow ? (workflow.status || workflow.state) : 'unknown',
-                            lastExecution: workflow ? workflow.lastExecution : null,
-                            currentExecution: workflow ? workflow.currentExecution : null,
-                            timestamp: Date.now(),
-                            nodeExecutions: nodeExecutions.length,
-                            errorCount: errors.length,
-                            totalLogs: recentLogs.length
-                        }});
-                    }});
-                }} else {{
-                    resolve({{recentLogs: [], workflowStatus: 'unknown'}});
+        seen_events = OrderedDict()
+        since = int((start_time - 5) * 1000)
+        workflow_literal = json_dumps(workflow_id)
+        
+        # Enhanced status checking script. The per-key offsets below keep each
+        # poll to new log entries; the workflows key is still read every time
+        # since the completion check depends on the workflow's live status
+        status_script = f"""
+        (async () => {{
+            if (typeof chrome === 'undefined' || !chrome.storage) {{
+                return {{recentLogs: [], workflowStatus: 'unknown'}};
+            }}
+            const result = await chrome.storage.local.get(['workflowLogs', 'workflows', 'executionLogs']);
+            const workflows = result.workflows || {{}};
+            const workflow = workflows[{workflow_literal}];
+            
+            // Log arrays are append-only, so each poll resumes from the offset
+            // scanned last time. The offset is dropped if the entry before it
+            // changed (array trimmed or rewritten) and the array is rescanned.
+            const automa = globalThis.__automa;
+            const offsets = automa && automa.index ? (automa.index[{workflow_literal}] ||= {{}}) : {{}};
+            const recentLogs = [];
+            const collect = (key, list) => {{
+                const last = offsets[key];
+                let start = 0;
+                if (last && last.length <= list.length && list[last.length - 1]?.timestamp === last.timestamp) {{
+                    start = last.length;
                 }}
-            }})
-            """
+                for (let i = start; i < list.length; i++) {{
+                    const log = list[i];
+                    if (log.workflowId === {workflow_literal} && log.timestamp > {since}) {{
+                        recentLogs.push(log);
+                    }}
+                }}
+                if (list.length) {{
+                    offsets[key] = {{length: list.length, timestamp: list[list.length - 1].timestamp}};
+                }}
+            }};
             
-            message = {
-                "id": int(time.time()),
-                "method": "Runtime.evaluate",
-                "params": {
-                    "expression": status_script,
-                    "awaitPromise": True,
-                    "returnByValue": True
-                }
-            }
+            // Find logs for this workflow since monitoring started
+            collect('workflowLogs', result.workflowLogs || []);
+            collect('executionLogs', result.executionLogs || []);
             
-            ws.send(json.dumps(message))
-            response = json.loads(ws.recv())
+            // Sort by timestamp
+            recentLogs.sort((a, b) => (a.timestamp || 0) - (b.timestamp || 0));
             
-            if "result" in response and "result" in response["result"]:
-                result_data = response["result"]["result"]["value"]
-                recent_logs = result_data.get('recentLogs', [])
-                
-                # Process new logs
-                new_logs = recent_logs[last_log_count:]
-                for log in new_logs:
-                    if log not in monitoring_results['execution_events']:
-                        monitoring_results['execution_events'].append(log)
-                        
-                        # Create timeline entry
-                        timeline_entry = {
-                            'timestamp': log.get('timestamp'),
-                            'event': log.get('message', 'Execution event'),
-                            'status': log.get('status', 'running'),
-                            'node_id': log.get('nodeId', ''),
-                            'node_name': log.get('nodeName', ''),
-                            'execution_time': log.get('executionTime', 0)
-                        }
-                        monitoring_results['execution_timeline'].append(timeline_entry)
-                        
-                        # Display progress
-                        timestamp_str = ""
-                        if log.get('timestamp') and str(log.get('timestamp')).isdigit():
-                            ts = int(log.get('timestamp')) / 1000
-                            timestamp_str = datetime.fromtimestamp(ts).strftime('%H:%M:%S')
-                        
-                        node_info = ""
-                        if log.get('nodeId'):
-                            node_info = f" [{log.get('nodeName', log.get('nodeId', '')[:8])}]"
-                        
-                        print(f"📝 {timestamp_str} {log.get('message', 'Event')}{node_info} - {log.get('status', 'running')}")
-                
-                last_log_count = len(recent_logs)
-                
-                # Update performance metrics
-                monitoring_results['performance_metrics']['nodes_executed'] = result_data.get('nodeExecutions', 0)
-                monitoring_results['performance_metrics']['errors_encountered'] = result_data.get('errorCount', 0)
+            return {{
+                recentLogs: recentLogs,
+                workflowStatus: workflow ? (workflow.status || workflow.state) : 'unknown',
+                lastExecution: workflow ? workflow.lastExecution : null,
+                currentExecution: workflow ? workflow.currentExecution : null,
+                timestamp: Date.now(),
+                totalLogs: recentLogs.length
+            }};
+        }})()"""
+        
+        # Storage listener that pushes matching changes as console messages
+        listener_script = f"""
+        (() => {{
+            if (typeof chrome === 'undefined' || !chrome.storage || !chrome.storage.onChanged) {{
+                return false;
+            }}
+            if (globalThis.__automaMonitor) {{
+                chrome.storage.onChanged.removeListener(globalThis.__automaMonitor);
+            }}
+            if (globalThis.__automa && globalThis.__automa.index) {{
+                delete globalThis.__automa.index[{workflow_literal}];
+            }}
+            globalThis.__automaMonitor = (changes, area) => {{
+                if (area !== 'local') return;
+                const evt = {{logs: []}};
+                ['workflowLogs', 'executionLogs'].forEach(key => {{
+                    if (!changes[key] || !Array.isArray(changes[key].newValue)) return;
+                    changes[key].newValue.forEach(log => {{
+                        if (log.workflowId === {workflow_literal} && log.timestamp > {since}) {{
+                            evt.logs.push(log);
+                        }}
+                    }});
+                }});
+                if (changes.workflows && changes.workflows.newValue) {{
+                    const workflow = changes.workflows.newValue[{workflow_literal}];
+                    if (workflow) {{
+                        evt.workflowStatus = workflow.status || workflow.state;
+                        evt.currentExecution = workflow.currentExecution || null;
+                    }}
+                }}
+                if (evt.logs.length || 'workflowStatus' in evt) {{
+                    console.log('{MONITOR_EVENT_PREFIX}' + JSON.stringify(evt));
+                }}
+            }};
+            chrome.storage.onChanged.addListener(globalThis.__automaMonitor);
+            return true;
+        }})()
+        """
+        
+        # Install the listener and take an initial snapshot in one go
+        client.enable_runtime()
+        client.events.clear()
+        listener_id = client.send_evaluate(listener_script, await_promise=False)
+        poll_id = client.send_evaluate(status_script)
+        listener_response = client.wait(listener_id)
+        push_mode = cdp_value(listener_response)[0] is True
+        pushed_any = False
+        
+        while True:
+            if poll_id is None:
+                # Push mode: sleep until the extension reports a storage change
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                event = client.next_event(min(remaining, POLL_INTERVAL))
+                if event is None:
+                    if not pushed_any and time.monotonic() - started > PUSH_GRACE_PERIOD:
+                        print("⚠️ No storage events received, falling back to polling")
+                        push_mode = False
+                        poll_id = client.send_evaluate(status_script)
+                    continue
+                if event.get("method") != "Runtime.consoleAPICalled":
+                    continue
+                args = event.get("params", {}).get("args") or [{}]
+                value = args[0].get("value")
+                if not isinstance(value, str) or not value.startswith(MONITOR_EVENT_PREFIX):
+                    continue
+                pushed_any = True
+                result_data = json_loads(value[len(MONITOR_EVENT_PREFIX):])
+            else:
+                poll_started = time.monotonic()
+                result_data, _ = cdp_value(client.wait(poll_id))
+                poll_id = None
+            
+            if result_data:
+                logs = result_data.get('logs') or result_data.get('recentLogs', [])
+                _record_monitor_logs(monitoring_results, seen_events, logs, verbose)
                 
                 # Check workflow status
-                status = result_data.get('workflowStatus', 'unknown')
-                current_exec = result_data.get('currentExecution')
-                
-                if status in ['completed', 'failed', 'stopped', 'finished', 'error']:
-                    monitoring_results['final_status'] = status
-                    print(f"🏁 Workflow {status}")
-                    break
-                elif current_exec and current_exec.get('status') in ['completed', 'failed', 'stopped']:
-                    monitoring_results['final_status'] = current_exec.get('status')
-                    print(f"🏁 Workflow {current_exec.get('status')}")
+                final_status = _finished_status(result_data.get('workflowStatus'), result_data.get('currentExecution'))
+                if final_status:
+                    monitoring_results['final_status'] = final_status
+                    print(f"🏁 Workflow {final_status}")
                     break
             
-            time.sleep(2)  # Check every 2 seconds
+            if not push_mode:
+                if time.monotonic() >= deadline:
+                    break
+                # Keep a fixed cadence: the round-trip counts towards the interval
+                time.sleep(max(0.0, poll_started + POLL_INTERVAL - time.monotonic()))
+                poll_id = client.send_evaluate(status_script)
         
-        ws.close()
+        # Detach the listener and drop any events still queued
+        if poll_id is not None:
+            client.wait(poll_id)
+        client.evaluate(
+            "globalThis.__automaMonitor && chrome.storage.onChanged.removeListener(globalThis.__automaMonitor)",
+            await_promise=False
+        )
+        client.events.clear()
         
         # Calculate final metrics
-        end_time = time.time()
         monitoring_results['ended_at'] = datetime.now().isoformat()
-        monitoring_results['performance_metrics']['total_execution_time'] = end_time - start_time
+        monitoring_results['performance_metrics']['total_execution_time'] = time.monotonic() - started
         
         # Summary
         metrics = monitoring_results['performance_metrics']
@@ -693,23 +1056,39 @@ def monitor_workflow_execution(ws_url: str, workflow_id: str, timeout: int = 60)
         print(f"   🔧 Nodes Executed: {metrics['nodes_executed']}")
         print(f"   ❌ Errors: {metrics['errors_encountered']}")
         print(f"   📝 Total Events: {len(monitoring_results['execution_events'])}")
-        
-        return monitoring_results
+        if monitoring_results['dropped_events']:
+            print(f"   🗑️ Dropped Events: {monitoring_results['dropped_events']} (only the newest {MONITOR_EVENT_CAP} kept)")
         
     except Exception as e:
         print(f"❌ Monitoring failed: {e}")
         monitoring_results['error'] = str(e)
-        return monitoring_results
+    
+    # Ring buffers become plain lists for the JSON dump
+    monitoring_results['execution_events'] = list(monitoring_results['execution_events'])
+    monitoring_results['execution_timeline'] = list(monitoring_results['execution_timeline'])
+    return monitoring_results
 
 def main():
     """Main execution function (enhanced)"""
-    start_time = time.time()
+    parser = argparse.ArgumentParser(description="Automa Workflow Trigger & Log Exporter")
+    parser.add_argument('--with-size', action='store_true',
+                        help="include the serialized size of each log entry in the CSV export")
+    parser.add_argument('--quiet', action='store_true',
+                        help="don't print each event while monitoring a workflow")
+    parser.add_argument('--trigger', metavar='ID[,ID...]',
+                        help="trigger the given workflow ids concurrently and exit")
+    args = parser.parse_args()
+    
+    start_time = time.monotonic()
     print_banner()
     
     # Create output directories
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    os.makedirs(LOGS_DIR, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_dir = Path(OUTPUT_DIR)
+    logs_dir = Path(LOGS_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    run_started = datetime.now()
+    timestamp = run_started.strftime('%Y%m%d_%H%M%S')
     
     # Find Automa context
     ws_url = find_automa_context()
@@ -719,138 +1098,155 @@ def main():
         print("💡 And that Automa extension is installed and active")
         return
     
-    # List available workflows
-    workflows = list_available_workflows(ws_url)
-    if not workflows:
-        print("❌ No workflows found")
-        print("💡 Make sure you have workflows created in Automa extension")
+    try:
+        client = CDPClient(ws_url)
+    except Exception as e:
+        print(f"❌ Cannot connect to Automa context: {e}")
         return
     
-    # Interactive workflow selection
-    print("\n🎯 Choose an action:")
-    print("1. Trigger a specific workflow (FIXED METHOD)")
-    print("2. Export existing logs only")
-    print("3. Trigger workflow and monitor execution")
-    print("4. Export all data (workflows + logs + analysis)")
-    print("5. Analyze workflow structure")
-    print("6. Trigger workflow with custom variables")
-    
-    choice = input("Enter choice (1-6): ").strip()
-    
-    workflow_id = None
-    workflow_name = None
-    variables = None
-    
-    if choice in ['1', '3', '6']:
-        # Select workflow to trigger
-        workflow_list = list(workflows.values())
-        print("\n📋 Select workflow to trigger:")
-        for i, wf in enumerate(workflow_list, 1):
-            status = "🔴 Disabled" if wf.get("isDisabled") else "🟢 Enabled"
-            print(f"{i}. {wf['name']} ({wf['id'][:8]}...) - {status}")
+    try:
+        bootstrap(client)
         
-        try:
-            wf_choice = int(input("Enter workflow number: ")) - 1
-            if 0 <= wf_choice < len(workflow_list):
-                selected_workflow = workflow_list[wf_choice]
-                workflow_id = selected_workflow['id']
-                workflow_name = selected_workflow['name']
-                
-                # Check if workflow is disabled
-                if selected_workflow.get('isDisabled'):
-                    print("⚠️ Warning: Selected workflow is disabled!")
-                    confirm = input("Continue anyway? (y/N): ").strip().lower()
-                    if confirm != 'y':
-                        print("❌ Operation cancelled")
-                        return
-                
-                # Get custom variables if requested
-                if choice == '6':
-                    print("\n📝 Enter workflow variables (JSON format, or press Enter for none):")
-                    variables_input = input("Variables: ").strip()
-                    if variables_input:
-                        try:
-                            variables = json.loads(variables_input)
-                            print(f"✅ Variables parsed: {variables}")
-                        except json.JSONDecodeError:
-                            print("❌ Invalid JSON format, proceeding without variables")
-                            variables = None
-                
-                # Trigger workflow using FIXED method
-                success = trigger_workflow_fixed(ws_url, workflow_id, workflow_name, variables)
-                
-                if success and choice == '3':
-                    # Monitor execution
-                    monitoring_data = monitor_workflow_execution(ws_url, workflow_id, 60)
+        # Non-interactive batch trigger
+        if args.trigger:
+            workflow_ids = [workflow_id.strip() for workflow_id in args.trigger.split(',') if workflow_id.strip()]
+            trigger_workflows(client, workflow_ids)
+            return
+        
+        # List available workflows
+        workflows = list_available_workflows(client)
+        if not workflows:
+            print("❌ No workflows found")
+            print("💡 Make sure you have workflows created in Automa extension")
+            return
+        
+        # Interactive workflow selection
+        print("\n🎯 Choose an action:")
+        print("1. Trigger a specific workflow (FIXED METHOD)")
+        print("2. Export existing logs only")
+        print("3. Trigger workflow and monitor execution")
+        print("4. Export all data (workflows + logs + analysis)")
+        print("5. Analyze workflow structure")
+        print("6. Trigger workflow with custom variables")
+        
+        choice = input("Enter choice (1-6): ").strip()
+        actions = MENU_ACTIONS.get(choice, frozenset())
+        
+        workflow_id = None
+        workflow_name = None
+        variables = None
+        
+        if 'trigger' in actions:
+            # Select workflow to trigger
+            workflow_list = list(workflows.values())
+            print("\n📋 Select workflow to trigger:")
+            for i, wf in enumerate(workflow_list, 1):
+                status = "🔴 Disabled" if wf.get("isDisabled") else "🟢 Enabled"
+                print(f"{i}. {wf['name']} ({wf['id'][:8]}...) - {status}")
+            
+            try:
+                wf_choice = int(input("Enter workflow number: ")) - 1
+                if 0 <= wf_choice < len(workflow_list):
+                    selected_workflow = workflow_list[wf_choice]
+                    workflow_id = selected_workflow['id']
+                    workflow_name = selected_workflow['name']
                     
-                    # Save monitoring data
-                    monitor_path = os.path.join(LOGS_DIR, f"workflow_monitor_{timestamp}.json")
-                    with open(monitor_path, 'w') as f:
-                        json.dump(monitoring_data, f, indent=2)
-                    print(f"📊 Monitoring data saved: {monitor_path}")
-                
-                if not success:
-                    print("❌ Workflow triggering failed, but continuing with log export...")
-            else:
-                print("❌ Invalid workflow selection")
+                    # Check if workflow is disabled
+                    if selected_workflow.get('isDisabled'):
+                        print("⚠️ Warning: Selected workflow is disabled!")
+                        confirm = input("Continue anyway? (y/N): ").strip().lower()
+                        if confirm != 'y':
+                            print("❌ Operation cancelled")
+                            return
+                    
+                    # Get custom variables if requested
+                    if 'variables' in actions:
+                        print("\n📝 Enter workflow variables (JSON format, or press Enter for none):")
+                        variables_input = input("Variables: ").strip()
+                        if variables_input:
+                            try:
+                                variables = json.loads(variables_input)
+                                print(f"✅ Variables parsed: {variables}")
+                            except json.JSONDecodeError:
+                                print("❌ Invalid JSON format, proceeding without variables")
+                                variables = None
+                    
+                    # Trigger workflow using FIXED method
+                    success = trigger_workflow_fixed(client, workflow_id, workflow_name, variables)
+                    
+                    if success and 'monitor' in actions:
+                        # Monitor execution
+                        monitoring_data = monitor_workflow_execution(client, workflow_id, 60, verbose=not args.quiet)
+                        
+                        # Save monitoring data
+                        monitor_path = logs_dir / f"workflow_monitor_{timestamp}.json"
+                        write_json(monitor_path, monitoring_data)
+                        print(f"📊 Monitoring data saved: {monitor_path}")
+                    
+                    if not success:
+                        print("❌ Workflow triggering failed, but continuing with log export...")
+                else:
+                    print("❌ Invalid workflow selection")
+                    return
+            except (ValueError, IndexError):
+                print("❌ Invalid input")
                 return
-        except (ValueError, IndexError):
-            print("❌ Invalid input")
-            return
-    
-    # Wait for logs to be generated
-    if choice in ['1', '3', '6']:
-        print("⏳ Waiting for execution logs...")
-        time.sleep(5)
-    
-    # Export logs
-    if choice in ['2', '3', '4']:
-        logs_data = export_workflow_logs(ws_url)
-        
-        if logs_data:
-            # Export to CSV
-            csv_path = os.path.join(OUTPUT_DIR, f"automa_logs_{timestamp}.csv")
-            csv_success = export_logs_to_csv(logs_data, csv_path)
+        
+        # Wait for logs to be generated
+        if 'trigger' in actions:
+            print("⏳ Waiting for execution logs...")
+            time.sleep(5)
+        
+        # Export logs
+        if 'logs' in actions:
+            logs_data = export_workflow_logs(client, include_sizes=args.with_size)
             
-            # Export to JSON
-            json_path = os.path.join(OUTPUT_DIR, f"automa_logs_{timestamp}.json")
-            json_success = export_logs_json(logs_data, json_path)
+            if logs_data:
+                # Export to CSV
+                csv_path = output_dir / f"automa_logs_{timestamp}.csv"
+                csv_success = export_logs_to_csv(logs_data, csv_path, include_size=args.with_size)
+                
+                # Export to JSON
+                json_path = output_dir / f"automa_logs_{timestamp}.json"
+                json_success = export_logs_json(logs_data, json_path, exported_at=run_started)
+                
+                print(f"\n📊 Log Export Results:")
+                if csv_success:
+                    print(f"  📋 CSV: {csv_path}")
+                if json_success:
+                    print(f"  💾 JSON: {json_path}")
+        
+        # Workflow analysis
+        if 'analysis' in actions:
+            print("\n🔍 Analyzing workflow structure...")
+            analysis_data = analyze_workflow_structure(ws_url)
             
-            print(f"\n📊 Log Export Results:")
-            if csv_success:
-                print(f"  📋 CSV: {csv_path}")
-            if json_success:
-                print(f"  💾 JSON: {json_path}")
-    
-    # Workflow analysis
-    if choice in ['4', '5']:
-        print("\n🔍 Analyzing workflow structure...")
-        analysis_data = analyze_workflow_structure(ws_url)
-        
-        if analysis_data:
-            analysis_path = os.path.join(OUTPUT_DIR, f"workflow_analysis_{timestamp}.json")
-            export_workflow_analysis(analysis_data, analysis_path)
-    
-    # Export workflows if full export requested
-    if choice == '4':
-        print("\n📋 Exporting workflow data...")
-        
-        # Export workflows to CSV
-        workflows_csv = os.path.join(OUTPUT_DIR, f"automa_workflows_{timestamp}.csv")
-        csv_wf_success = export_workflows_to_csv(ws_url, workflows_csv)
-        
-        # Export detailed workflows to JSON
-        workflows_json = os.path.join(OUTPUT_DIR, f"automa_workflows_detailed_{timestamp}.json")
-        json_wf_success = export_detailed_workflows_json(ws_url, workflows_json)
-        
-        print(f"\n📋 Workflow Export Results:")
-        if csv_wf_success:
-            print(f"  📊 Workflows CSV: {workflows_csv}")
-        if json_wf_success:
-            print(f"  💾 Detailed JSON: {workflows_json}")
+            if analysis_data:
+                analysis_path = output_dir / f"workflow_analysis_{timestamp}.json"
+                export_workflow_analysis(analysis_data, analysis_path)
+        
+        # Export workflows if full export requested
+        if 'workflows' in actions:
+            print("\n📋 Exporting workflow data...")
+            
+            # Export workflows to CSV
+            workflows_csv = output_dir / f"automa_workflows_{timestamp}.csv"
+            csv_wf_success = export_workflows_to_csv(ws_url, workflows_csv)
+            
+            # Export detailed workflows to JSON
+            workflows_json = output_dir / f"automa_workflows_detailed_{timestamp}.json"
+            json_wf_success = export_detailed_workflows_json(ws_url, workflows_json)
+            
+            print(f"\n📋 Workflow Export Results:")
+            if csv_wf_success:
+                print(f"  📊 Workflows CSV: {workflows_csv}")
+            if json_wf_success:
+                print(f"  💾 Detailed JSON: {workflows_json}")
+    finally:
+        client.close()
     
     # Summary
-    execution_time = time.time() - start_time
+    execution_time = time.monotonic() - start_time
     print(f"\n⏱️ Process completed in {execution_time:.2f} seconds")
     print("🎉 All operations completed successfully!")
     
@@ -5,12 +5,176 @@ Debug Chrome contexts and find Automa extension more reliably
 """
 
 import os
-import json
+import re
+import itertools
 import requests
 import websocket
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional
+from json_utils import json_dumps, json_loads
 
 CHROME_DEBUG_URL = "http://localhost:9222/json"
+PROBE_WORKERS = 8  # contexts probed concurrently
+AUTOMA_KEYWORD_RE = re.compile(r"automa|automation|workflow", re.IGNORECASE)
+AUTOMA_NAME_RE = re.compile(r"automa", re.IGNORECASE)
+
+# Shared keep-alive session for DevTools HTTP requests. They all go to the
+# one DevTools host, so a single connection pool is enough
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=16))
+
+# Checks a context for Automa-specific APIs
+TEST_SCRIPT = """
+(function() {
+    const results = {
+        hasChrome: typeof chrome !== 'undefined',
+        hasChromeStorage: typeof chrome !== 'undefined' && !!chrome.storage,
+        hasChromeRuntime: typeof chrome !== 'undefined' && !!chrome.runtime,
+        hasAutoma: false,
+        automaObjects: [],
+        extensionId: '',
+        manifestVersion: 'unknown'
+    };
+    
+    // Check for Chrome extension APIs
+    if (typeof chrome !== 'undefined') {
+        if (chrome.runtime && chrome.runtime.id) {
+            results.extensionId = chrome.runtime.id;
+        }
+        if (chrome.runtime && chrome.runtime.getManifest) {
+            try {
+                const manifest = chrome.runtime.getManifest();
+                results.manifestVersion = manifest.manifest_version || 'unknown';
+                if (manifest.name && manifest.name.toLowerCase().includes('automa')) {
+                    results.hasAutoma = true;
+                }
+            } catch(e) {}
+        }
+    }
+    
+    // Check for Automa-specific objects in window
+    const automaKeys = Object.keys(window).filter(key => 
+        key.toLowerCase().includes('automa') || 
+        key.toLowerCase().includes('workflow') ||
+        key.toLowerCase().includes('automation')
+    );
+    results.automaObjects = automaKeys;
+    
+    // Check for common Automa patterns
+    if (automaKeys.length > 0 || 
+        document.querySelector('[data-testid*="automa"]') ||
+        document.querySelector('.automa') ||
+        window.location.href.includes('automa')) {
+        results.hasAutoma = true;
+    }
+    
+    return results;
+})()
+"""
+
+# Reads workflow and log counts from the context's extension storage
+STORAGE_TEST_SCRIPT = """
+new Promise((resolve) => {
+    if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
+        chrome.storage.local.get(['workflows', 'workflowLogs'], (result) => {
+            const workflows = result.workflows || {};
+            const logs = result.workflowLogs || [];
+            
+            resolve({
+                success: true,
+                hasWorkflows: Object.keys(workflows).length > 0,
+                workflowCount: Object.keys(workflows).length,
+                hasLogs: logs.length > 0,
+                logCount: logs.length,
+                storageKeys: Object.keys(result)
+            });
+        });
+    } else {
+        resolve({
+            success: false,
+            error: 'Chrome storage not available'
+        });
+    }
+})
+"""
+
+# Both probes in one expression; a failing probe doesn't hide the other
+PROBE_SCRIPT = """
+(async () => {
+    let meta = null;
+    try {
+        meta = """ + TEST_SCRIPT.strip() + """;
+    } catch(e) {}
+    let storage;
+    try {
+        storage = await """ + STORAGE_TEST_SCRIPT.strip() + """;
+    } catch(e) {
+        storage = { success: false, error: e.message };
+    }
+    return { meta: meta, storage: storage };
+})()
+"""
+
+# Reads the extension manifest of a context
+MANIFEST_SCRIPT = """
+(function() {
+    if (typeof chrome !== 'undefined' && chrome.runtime && chrome.runtime.getManifest) {
+        try {
+            const manifest = chrome.runtime.getManifest();
+            return {
+                name: manifest.name || 'Unknown',
+                version: manifest.version || 'Unknown',
+                description: manifest.description || '',
+                id: chrome.runtime.id || 'Unknown'
+            };
+        } catch(e) {
+            return { error: e.message };
+        }
+    }
+    return { error: 'No manifest access' };
+})()
+"""
+
+# Runtime.evaluate params are built once and reused for every context
+PROBE_PARAMS = {
+    "expression": PROBE_SCRIPT,
+    "awaitPromise": True,
+    "returnByValue": True
+}
+MANIFEST_PARAMS = {
+    "expression": MANIFEST_SCRIPT,
+    "returnByValue": True
+}
+
+class CDPSession:
+    """One WebSocket to a Chrome context, shared by every CDP call made on it
+
+    Commands get increasing ids and events arriving in between are skipped.
+    """
+
+    def __init__(self, ws_url: str, timeout: float = 5):
+        self.ws = websocket.create_connection(ws_url, timeout=timeout)
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a CDP command and wait for its response"""
+        message_id = next(self._ids)
+        self.ws.send(json_dumps({"id": message_id, "method": method, "params": params or {}}))
+        while True:
+            response = json_loads(self.ws.recv())
+            if response.get("id") == message_id:
+                return response
+
+    def close(self):
+        """Close the underlying WebSocket"""
+        self.ws.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 def print_banner():
     """Print debug banner"""
@@ -26,7 +190,7 @@ def get_chrome_tabs_detailed() -> List[Dict]:
     """Get detailed Chrome tab information"""
     try:
         print("🔍 Connecting to Chrome DevTools...")
-        response = requests.get(CHROME_DEBUG_URL, timeout=10)
+        response = SESSION.get(CHROME_DEBUG_URL, timeout=10)
         
         if response.status_code == 200:
             tabs = response.json()
@@ -36,7 +200,7 @@ def get_chrome_tabs_detailed() -> List[Dict]:
             print(f"❌ Chrome DevTools error - Status: {response.status_code}")
             return []
             
-    except requests.exceptions.ConnectError:
+    except requests.exceptions.ConnectionError:
         print("❌ Connection refused to Chrome DevTools")
         print("💡 Troubleshooting steps:")
         print("   1. Make sure Chrome is running")
@@ -78,9 +242,7 @@ def analyze_chrome_contexts(tabs: List[Dict]):
             })
         
         # Find potential Automa contexts
-        automa_keywords = ['automa', 'automation', 'workflow']
-        if any(keyword in title.lower() for keyword in automa_keywords) or \
-           any(keyword in url.lower() for keyword in automa_keywords):
+        if AUTOMA_KEYWORD_RE.search(title) or AUTOMA_KEYWORD_RE.search(url):
             automa_candidates.append({
                 'index': i,
                 'title': title,
@@ -113,166 +275,74 @@ def analyze_chrome_contexts(tabs: List[Dict]):
     
     return extension_contexts, automa_candidates
 
-def test_extension_context(ws_url: str, context_name: str) -> Dict[str, Any]:
-    """Test if a context has Automa functionality"""
-    print(f"\n🧪 Testing context: {context_name}")
-    
+def probe_context(ws_url: str) -> Dict[str, Any]:
+    """Run the Automa and storage probes in one round-trip on a single connection
+
+    Returns ``{'meta': ..., 'storage': ...}``, or ``{'error': ...}`` if the
+    context could not be reached.
+    """
     try:
-        ws = websocket.create_connection(ws_url, timeout=5)
-        
-        # Test for Automa-specific APIs
-        test_script = """
-        (function() {
-            const results = {
-                hasChrome: typeof chrome !== 'undefined',
-                hasChromeStorage: typeof chrome !== 'undefined' && !!chrome.storage,
-                hasChromeRuntime: typeof chrome !== 'undefined' && !!chrome.runtime,
-                hasAutoma: false,
-                automaObjects: [],
-                extensionId: '',
-                manifestVersion: 'unknown'
-            };
-            
-            // Check for Chrome extension APIs
-            if (typeof chrome !== 'undefined') {
-                if (chrome.runtime && chrome.runtime.id) {
-                    results.extensionId = chrome.runtime.id;
-                }
-                if (chrome.runtime && chrome.runtime.getManifest) {
-                    try {
-                        const manifest = chrome.runtime.getManifest();
-                        results.manifestVersion = manifest.manifest_version || 'unknown';
-                        if (manifest.name && manifest.name.toLowerCase().includes('automa')) {
-                            results.hasAutoma = true;
-                        }
-                    } catch(e) {}
-                }
-            }
-            
-            // Check for Automa-specific objects in window
-            const automaKeys = Object.keys(window).filter(key => 
-                key.toLowerCase().includes('automa') || 
-                key.toLowerCase().includes('workflow') ||
-                key.toLowerCase().includes('automation')
-            );
-            results.automaObjects = automaKeys;
-            
-            // Check for common Automa patterns
-            if (automaKeys.length > 0 || 
-                document.querySelector('[data-testid*="automa"]') ||
-                document.querySelector('.automa') ||
-                window.location.href.includes('automa')) {
-                results.hasAutoma = true;
-            }
-            
-            return results;
-        })()
-        """
-        
-        message = {
-            "id": 1,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": test_script,
-                "returnByValue": True
-            }
-        }
-        
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
-        ws.close()
+        with CDPSession(ws_url) as session:
+            response = session.call("Runtime.evaluate", PROBE_PARAMS)
         
         if "result" in response and "result" in response["result"]:
-            result_data = response["result"]["result"]["value"]
-            
-            print(f"   Chrome APIs: {'✅' if result_data.get('hasChrome') else '❌'}")
-            print(f"   Chrome Storage: {'✅' if result_data.get('hasChromeStorage') else '❌'}")
-            print(f"   Chrome Runtime: {'✅' if result_data.get('hasChromeRuntime') else '❌'}")
-            print(f"   Automa Detected: {'✅' if result_data.get('hasAutoma') else '❌'}")
-            
-            if result_data.get('extensionId'):
-                print(f"   Extension ID: {result_data['extensionId']}")
-            if result_data.get('automaObjects'):
-                print(f"   Automa Objects: {result_data['automaObjects']}")
-                
-            return result_data
-        else:
-            print("   ❌ Failed to execute test script")
-            return {}
-            
+            return response["result"]["result"].get("value") or {}
+        return {}
+        
     except Exception as e:
-        print(f"   ❌ Test failed: {e}")
+        return {'error': str(e)}
+
+def report_extension_test(context_name: str, probe: Dict[str, Any]) -> Dict[str, Any]:
+    """Print the Automa functionality probe for a context and return its result"""
+    print(f"\n🧪 Testing context: {context_name}")
+    
+    if probe.get('error'):
+        print(f"   ❌ Test failed: {probe['error']}")
+        return {}
+    
+    result_data = probe.get('meta')
+    if not result_data:
+        print("   ❌ Failed to execute test script")
         return {}
+    
+    print(f"   Chrome APIs: {'✅' if result_data.get('hasChrome') else '❌'}")
+    print(f"   Chrome Storage: {'✅' if result_data.get('hasChromeStorage') else '❌'}")
+    print(f"   Chrome Runtime: {'✅' if result_data.get('hasChromeRuntime') else '❌'}")
+    print(f"   Automa Detected: {'✅' if result_data.get('hasAutoma') else '❌'}")
+    
+    if result_data.get('extensionId'):
+        print(f"   Extension ID: {result_data['extensionId']}")
+    if result_data.get('automaObjects'):
+        print(f"   Automa Objects: {result_data['automaObjects']}")
+        
+    return result_data
 
-def try_storage_access(ws_url: str, context_name: str) -> bool:
-    """Try to access Chrome storage in this context"""
+def report_storage_access(context_name: str, probe: Dict[str, Any]) -> bool:
+    """Print the storage probe for a context and return whether it holds Automa data"""
     print(f"\n💾 Testing storage access in: {context_name}")
     
-    try:
-        ws = websocket.create_connection(ws_url, timeout=5)
-        
-        storage_test_script = """
-        new Promise((resolve) => {
-            if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
-                chrome.storage.local.get(['workflows', 'workflowLogs'], (result) => {
-                    const workflows = result.workflows || {};
-                    const logs = result.workflowLogs || [];
-                    
-                    resolve({
-                        success: true,
-                        hasWorkflows: Object.keys(workflows).length > 0,
-                        workflowCount: Object.keys(workflows).length,
-                        hasLogs: logs.length > 0,
-                        logCount: logs.length,
-                        storageKeys: Object.keys(result)
-                    });
-                });
-            } else {
-                resolve({
-                    success: false,
-                    error: 'Chrome storage not available'
-                });
-            }
-        })
-        """
-        
-        message = {
-            "id": 2,
-            "method": "Runtime.evaluate",
-            "params": {
-                "expression": storage_test_script,
-                "awaitPromise": True,
-                "returnByValue": True
-            }
-        }
+    if probe.get('error'):
+        print(f"   ❌ Storage test failed: {probe['error']}")
+        return False
+    
+    result_data = probe.get('storage')
+    if not result_data:
+        print("   ❌ Invalid storage response")
+        return False
+    
+    if result_data.get("success"):
+        workflow_count = result_data.get("workflowCount", 0)
+        log_count = result_data.get("logCount", 0)
+        storage_keys = result_data.get("storageKeys", [])
         
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
-        ws.close()
+        print(f"   ✅ Storage access successful")
+        print(f"   📋 Workflows found: {workflow_count}")
+        print(f"   📊 Logs found: {log_count}")
+        print(f"   🔑 Storage keys: {storage_keys}")
         
-        if "result" in response and "result" in response["result"]:
-            result_data = response["result"]["result"]["value"]
-            
-            if result_data.get("success"):
-                workflow_count = result_data.get("workflowCount", 0)
-                log_count = result_data.get("logCount", 0)
-                storage_keys = result_data.get("storageKeys", [])
-                
-                print(f"   ✅ Storage access successful")
-                print(f"   📋 Workflows found: {workflow_count}")
-                print(f"   📊 Logs found: {log_count}")
-                print(f"   🔑 Storage keys: {storage_keys}")
-                
-                return workflow_count > 0 or log_count > 0
-            else:
-                print(f"   ❌ Storage access failed: {result_data.get('error')}")
-                return False
-        else:
-            print("   ❌ Invalid storage response")
-            return False
-            
-    except Exception as e:
-        print(f"   ❌ Storage test failed: {e}")
+        return workflow_count > 0 or log_count > 0
+    else:
+        print(f"   ❌ Storage access failed: {result_data.get('error')}")
         return False
 
 def open_automa_extension() -> Optional[str]:
@@ -290,7 +360,7 @@ def open_automa_extension() -> Optional[str]:
         for url in automa_urls:
             try:
                 print(f"   Trying: {url}")
-                response = requests.get(f"{CHROME_DEBUG_URL}/new?{url}")
+                response = SESSION.get(f"{CHROME_DEBUG_URL}/new?{url}")
                 
                 if response.status_code == 200:
                     new_tab = response.json()
@@ -308,60 +378,45 @@ def open_automa_extension() -> Optional[str]:
         print(f"❌ Failed to open extension: {e}")
         return None
 
-def find_automa_by_manifest():
-    """Try to find Automa by checking extension manifests"""
+def _probe_manifest(ws_url: str) -> Optional[Dict[str, Any]]:
+    """Read the extension manifest of a context, or None if it can't be reached"""
+    try:
+        with CDPSession(ws_url, timeout=3) as session:
+            response = session.call("Runtime.evaluate", MANIFEST_PARAMS)
+        
+        if "result" in response and "result" in response["result"]:
+            return response["result"]["result"]["value"]
+        return None
+        
+    except Exception:
+        return None
+
+def find_automa_by_manifest(tabs: Optional[List[Dict]] = None) -> Optional[str]:
+    """Try to find Automa by checking extension manifests
+
+    ``tabs`` is the tab list already fetched by the caller; it is only
+    requested from Chrome again when not given.
+    """
     print("\n🔍 Searching for Automa by extension manifest...")
     
-    tabs = get_chrome_tabs_detailed()
-    extension_tabs = [tab for tab in tabs if 'chrome-extension://' in tab.get('url', '')]
+    tabs = tabs or get_chrome_tabs_detailed()
+    extension_urls = [tab['webSocketDebuggerUrl'] for tab in tabs
+                      if 'chrome-extension://' in tab.get('url', '') and tab.get('webSocketDebuggerUrl')]
     
-    for tab in extension_tabs:
-        ws_url = tab.get('webSocketDebuggerUrl')
-        if ws_url:
-            try:
-                ws = websocket.create_connection(ws_url, timeout=3)
-                
-                manifest_script = """
-                (function() {
-                    if (typeof chrome !== 'undefined' && chrome.runtime && chrome.runtime.getManifest) {
-                        try {
-                            const manifest = chrome.runtime.getManifest();
-                            return {
-                                name: manifest.name || 'Unknown',
-                                version: manifest.version || 'Unknown',
-                                description: manifest.description || '',
-                                id: chrome.runtime.id || 'Unknown'
-                            };
-                        } catch(e) {
-                            return { error: e.message };
-                        }
-                    }
-                    return { error: 'No manifest access' };
-                })()
-                """
-                
-                message = {
-                    "id": 1,
-                    "method": "Runtime.evaluate",
-                    "params": {"expression": manifest_script, "returnByValue": True}
-                }
-                
-                ws.send(json.dumps(message))
-                response = json.loads(ws.recv())
-                ws.close()
-                
-                if "result" in response and "result" in response["result"]:
-                    manifest = response["result"]["result"]["value"]
-                    name = manifest.get('name', '').lower()
-                    
-                    if 'automa' in name:
-                        print(f"   ✅ Found Automa: {manifest.get('name')} v{manifest.get('version')}")
-                        print(f"   📋 Description: {manifest.get('description', '')[:60]}...")
-                        print(f"   🆔 Extension ID: {manifest.get('id')}")
-                        return ws_url
-                        
-            except Exception as e:
-                continue
+    # Probe all extension tabs at once and stop at the first Automa manifest
+    executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS)
+    try:
+        futures = {executor.submit(_probe_manifest, ws_url): ws_url for ws_url in extension_urls}
+        for future in as_completed(futures):
+            manifest = future.result()
+            if manifest and AUTOMA_NAME_RE.search(manifest.get('name', '')):
+                print(f"   ✅ Found Automa: {manifest.get('name')} v{manifest.get('version')}")
+                print(f"   📋 Description: {manifest.get('description', '')[:60]}...")
+                print(f"   🆔 Extension ID: {manifest.get('id')}")
+                return futures[future]
+    finally:
+        # Don't wait on probes still in flight once a match is found
+        executor.shutdown(wait=False, cancel_futures=True)
     
     print("   ❌ Automa not found via manifest search")
     return None
@@ -384,13 +439,20 @@ def main():
     
     viable_contexts = []
     
+    # Probe every distinct context concurrently; the probes only wait on sockets
+    ws_urls = [tabs[ctx['index']].get('webSocketDebuggerUrl') for ctx in automa_candidates + extension_contexts]
+    ws_urls = list(dict.fromkeys(url for url in ws_urls if url))
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        probes = dict(zip(ws_urls, executor.map(probe_context, ws_urls)))
+    
     # Test automa candidates first
     for candidate in automa_candidates:
         ws_url = tabs[candidate['index']].get('webSocketDebuggerUrl')
         if ws_url:
-            test_result = test_extension_context(ws_url, candidate['title'])
+            probe = probes[ws_url]
+            test_result = report_extension_test(candidate['title'], probe)
             if test_result.get('hasAutoma') or test_result.get('hasChromeStorage'):
-                storage_access = try_storage_access(ws_url, candidate['title'])
+                storage_access = report_storage_access(candidate['title'], probe)
                 if storage_access:
                     viable_contexts.append({
                         'ws_url': ws_url,
@@ -402,8 +464,9 @@ def main():
     for ext in extension_contexts:
         ws_url = tabs[ext['index']].get('webSocketDebuggerUrl')
         if ws_url:
-            test_result = test_extension_context(ws_url, ext['title'])
-            storage_access = try_storage_access(ws_url, ext['title'])
+            probe = probes[ws_url]
+            test_result = report_extension_test(ext['title'], probe)
+            storage_access = report_storage_access(ext['title'], probe)
             
             score = 0
             if test_result.get('hasAutoma'): score += 5
@@ -423,7 +486,7 @@ def main():
         print("="*50)
         
         # Method 1: Search by manifest
-        manifest_url = find_automa_by_manifest()
+        manifest_url = find_automa_by_manifest(tabs)
         if manifest_url:
             viable_contexts.append({
                 'ws_url': manifest_url,
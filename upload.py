@@ -5,18 +5,105 @@ Enhanced with comprehensive logging and status messages.
 """
 
 import os
+import sys
 import json
+import mmap
+import queue
 import time
+import atexit
 import logging
-import requests
-import websocket
+import logging.handlers
 import urllib.parse
-from datetime import datetime
+from typing import Optional
+from json_utils import json_dumps, json_loads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 CHROME_DEBUG_URL = "http://localhost:9222/json"
 WORKFLOW_FILE = "/workspace/workflows/test.automa.json"
 LOG_LEVEL = logging.INFO
+WS_TIMEOUT = 5.0  # seconds to wait for a required CDP reply
+REPLY_LINGER_TIMEOUT = 0.1  # seconds to wait for optional CDP replies
+# Sleeps between /json connection attempts, all within CONNECT_DEADLINE seconds
+CONNECT_BACKOFF = (0.05, 0.1, 0.2, 0.5, 1.0)
+CONNECT_DEADLINE = 2.0
+AUTOMA_CONTEXT_LABELS = {3: "background page", 2: "extension page", 1: "related page"}
+# Chrome's frames are always valid UTF-8, so skip re-validating them; without
+# an Origin header newer Chrome builds accept the DevTools socket even when
+# started without --remote-allow-origins
+WS_OPTIONS = {"skip_utf8_validation": True, "suppress_origin": True}
+
+# Storage writer, called on the target's global object with the workflows map;
+# it resolves from the storage.set callback, once the write is persisted
+STORAGE_FUNCTION = """function (workflows) {
+    if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
+        return new Promise((resolve, reject) => {
+            chrome.storage.local.set({workflows: workflows}, () => {
+                if (chrome.runtime && chrome.runtime.lastError) {
+                    reject(new Error(chrome.runtime.lastError.message));
+                    return;
+                }
+                console.log('Workflows saved to chrome.storage.local');
+                resolve('chrome_storage_done');
+            });
+        });
+    }
+    return 'chrome_storage_unavailable';
+}"""
+
+# Shared keep-alive session for DevTools HTTP requests, created on first use
+# so runs that abort before talking to Chrome never import requests
+_session = None
+
+def get_session():
+    """Return the shared DevTools HTTP session, creating it on first call"""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _session = requests.Session()
+        _session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        _session.headers["Connection"] = "keep-alive"
+        atexit.register(_session.close)
+    return _session
+
+def validate_workflow(data) -> Optional[str]:
+    """Check the keys Automa needs; returns an error message or None
+
+    ``id`` and ``name`` may be missing (they default to the file name) but
+    must be strings when present.
+    """
+    if not isinstance(data, dict):
+        return f"expected a JSON object, got {type(data).__name__}"
+    if "drawflow" not in data:
+        return "missing 'drawflow'"
+    if not isinstance(data["drawflow"], (dict, str)):
+        return "'drawflow' must be an object or a JSON string"
+    for key in ("id", "name"):
+        if key in data and not isinstance(data[key], str):
+            return f"'{key}' must be a string"
+    return None
+
+def _dumps_bytes(obj) -> bytes:
+    """Encode JSON as UTF-8 bytes, ready to send as a text frame"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def _load_json_file(f):
+    """Parse an open binary JSON file
+
+    With orjson the file is memory-mapped and parsed straight from the
+    mapping, skipping the read into a Python string.
+    """
+    if not orjson:
+        return json.load(f)
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
 
 # Setup logging
 def setup_logging():
@@ -27,20 +114,29 @@ def setup_logging():
     # Create logs directory if it doesn't exist
     log_dir = "/workspace/logs"
     os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, f"automa_upload_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+    log_file = os.path.join(log_dir, f"automa_upload_{time.strftime('%Y%m%d_%H%M%S')}.log")
     
-    # Configure logging
-    logging.basicConfig(
-        level=LOG_LEVEL,
-        format=log_format,
-        datefmt=date_format,
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
+    # File writes happen on a QueueListener thread so they stay off the
+    # WebSocket path; the console handler stays inline to keep its lines
+    # ordered with the banners. Console lines are the bare messages on stdout,
+    # so status output is no longer duplicated with print()
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(log_format, datefmt=date_format))
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
     logger = logging.getLogger(__name__)
+    logger.setLevel(LOG_LEVEL)
+    logger.addHandler(queue_handler)
+    logger.addHandler(console_handler)
+    logger.propagate = False
     logger.info(f"📝 Logging initialized. Log file: {log_file}")
     return logger
 
@@ -60,113 +156,121 @@ def print_banner():
 
 def get_chrome_tabs():
     """Get all Chrome tabs and pages"""
+    import requests
+    
     logger.info("🔍 Attempting to connect to Chrome DevTools...")
-    print("🔍 Connecting to Chrome DevTools Protocol...")
     
     try:
-        logger.debug(f"Making request to: {CHROME_DEBUG_URL}")
-        response = requests.get(CHROME_DEBUG_URL, timeout=10)
+        # Chrome may still be starting: retry failed connects with short
+        # backoff until CONNECT_DEADLINE passes. Connects to localhost fail
+        # fast, so only the read gets a long timeout (a busy Chrome is slow
+        # to answer, and read timeouts are not retried)
+        deadline = time.monotonic() + CONNECT_DEADLINE
+        delays = iter(CONNECT_BACKOFF)
+        while True:
+            try:
+                logger.debug(f"Making request to: {CHROME_DEBUG_URL}")
+                response = get_session().get(CHROME_DEBUG_URL, timeout=(0.5, 10))
+                break
+            except requests.exceptions.ConnectionError as e:
+                delay = next(delays, None)
+                if delay is None or time.monotonic() + delay >= deadline:
+                    raise
+                logger.debug(f"Chrome DevTools not reachable yet ({e}), retrying in {delay}s")
+                time.sleep(delay)
         
         if response.status_code == 200:
             tabs = response.json()
             logger.info(f"✅ Successfully connected to Chrome. Found {len(tabs)} contexts.")
-            print(f"✅ Connected to Chrome - Found {len(tabs)} browser contexts")
             return tabs
         else:
             logger.error(f"❌ Chrome DevTools returned status code: {response.status_code}")
-            print(f"❌ Chrome DevTools error - Status code: {response.status_code}")
             return []
             
-    except requests.exceptions.ConnectError as e:
-        logger.error(f"❌ Connection refused to Chrome DevTools: {e}")
-        print("❌ Cannot connect to Chrome DevTools - Is Chrome running with --remote-debugging-port=9222?")
+    except requests.exceptions.ConnectionError as e:
+        logger.error(f"❌ Cannot connect to Chrome DevTools - Is Chrome running with --remote-debugging-port=9222? ({e})")
         return []
     except requests.exceptions.Timeout as e:
         logger.error(f"❌ Timeout connecting to Chrome DevTools: {e}")
-        print("❌ Timeout connecting to Chrome DevTools")
         return []
     except Exception as e:
         logger.error(f"❌ Unexpected error getting Chrome tabs: {e}")
-        print(f"❌ Failed to get Chrome contexts: {e}")
         return []
 
-def find_automa_context():
+def find_automa_context(tabs=None):
     """Find Automa extension context (background page or any page with Automa)"""
     logger.info("🔍 Searching for Automa extension context...")
-    print("🔍 Searching for Automa extension context...")
     
-    tabs = get_chrome_tabs()
+    if tabs is None:
+        tabs = get_chrome_tabs()
     if not tabs:
         return None
     
-    print("\n📋 Available Chrome contexts:")
-    logger.info("Available Chrome contexts:")
+    logger.info("📋 Available Chrome contexts:")
     
     for i, tab in enumerate(tabs):
         title = tab.get('title', 'Unknown')
         url = tab.get('url', 'Unknown')
         tab_type = tab.get('type', 'Unknown')
         context_info = f"  {i+1}. [{tab_type}] {title} - {url[:60]}..."
-        print(context_info)
+        logger.info(context_info)
         logger.debug(f"Context {i+1}: Type={tab_type}, Title={title}, URL={url}")
     
-    # Priority 1: Background pages with Automa
-    logger.info("🎯 Searching for Automa background pages...")
-    for tab in tabs:
-        if (tab.get('type') == 'background_page' and 
-            ('automa' in tab.get('title', '').lower() or 
-             'automa' in tab.get('url', '').lower())):
-            context_info = f"✅ Found Automa background page: {tab.get('title')}"
-            print(context_info)
-            logger.info(f"Found Automa background page: {tab.get('title')} - {tab.get('url')}")
-            return tab.get('webSocketDebuggerUrl')
-    
-    # Priority 2: Extension pages with Automa
-    logger.info("🎯 Searching for Automa extension pages...")
+    # Single pass; the first tab at the highest priority wins:
+    # 3 = background page, 2 = extension page, 1 = Automa in title
+    logger.info("🎯 Searching for Automa background/extension pages...")
+    best_tab, best_priority = None, 0
     for tab in tabs:
-        url = tab.get('url', '').lower()
-        if 'chrome-extension' in url and 'automa' in url:
-            context_info = f"✅ Found Automa extension page: {tab.get('title')}"
-            print(context_info)
-            logger.info(f"Found Automa extension page: {tab.get('title')} - {tab.get('url')}")
-            return tab.get('webSocketDebuggerUrl')
+        title_l = tab.get('title', '').lower()
+        url_l = tab.get('url', '').lower()
+        if tab.get('type') == 'background_page' and ('automa' in title_l or 'automa' in url_l):
+            best_tab, best_priority = tab, 3
+            break
+        if best_priority < 2 and 'chrome-extension' in url_l and 'automa' in url_l:
+            best_tab, best_priority = tab, 2
+        elif best_priority < 1 and 'automa' in title_l:
+            best_tab, best_priority = tab, 1
     
-    # Priority 3: Any page with Automa in title
-    logger.info("🎯 Searching for pages with 'Automa' in title...")
-    for tab in tabs:
-        if 'automa' in tab.get('title', '').lower():
-            context_info = f"✅ Found Automa-related page: {tab.get('title')}"
-            print(context_info)
-            logger.info(f"Found Automa-related page: {tab.get('title')} - {tab.get('url')}")
-            return tab.get('webSocketDebuggerUrl')
+    if best_tab is not None:
+        label = AUTOMA_CONTEXT_LABELS[best_priority]
+        logger.info(f"✅ Found Automa {label}: {best_tab.get('title')} - {best_tab.get('url')}")
+        return best_tab.get('webSocketDebuggerUrl')
     
     logger.warning("⚠️ No Automa context found in available tabs")
-    print("⚠️ No Automa extension context found")
     return None
 
 def load_workflows():
     """Load the single workflow JSON file"""
     logger.info(f"📁 Loading workflow file: {WORKFLOW_FILE}")
-    print(f"📁 Loading workflow from: {WORKFLOW_FILE}")
     
     workflows = []
     
-    # Check if file exists
-    if not os.path.exists(WORKFLOW_FILE):
+    # Open once and stat the descriptor instead of exists() + getsize() on the path
+    try:
+        f = open(WORKFLOW_FILE, "rb")
+    except FileNotFoundError:
         error_msg = f"❌ Workflow file not found: {WORKFLOW_FILE}"
         logger.error(error_msg)
-        print(error_msg)
         return workflows
-    
-    # Check file size
-    file_size = os.path.getsize(WORKFLOW_FILE)
-    logger.info(f"📊 File size: {file_size} bytes")
-    print(f"📊 File size: {file_size:,} bytes")
+    except OSError as e:
+        error_msg = f"❌ Cannot open {WORKFLOW_FILE}: {e}"
+        logger.error(error_msg)
+        return workflows
     
     try:
-        logger.debug("🔄 Reading and parsing JSON file...")
-        with open(WORKFLOW_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with f:
+            file_size = os.fstat(f.fileno()).st_size
+            logger.info(f"📊 File size: {file_size} bytes")
+            
+            logger.debug("🔄 Reading and parsing JSON file...")
+            data = _load_json_file(f)
+        
+        # Reject files Automa would not show before opening a connection
+        validation_error = validate_workflow(data)
+        if validation_error:
+            error_msg = f"❌ Invalid workflow in {WORKFLOW_FILE}: {validation_error}"
+            logger.error(error_msg)
+            return workflows
         
         # Process workflow data
         filename = os.path.splitext(os.path.basename(WORKFLOW_FILE))[0]
@@ -185,116 +289,163 @@ def load_workflows():
         
         success_msg = f"✅ Successfully loaded workflow: '{data['name']}' (ID: {data['id']})"
         logger.info(success_msg)
-        print(success_msg)
         
         # Log workflow details
         workflow_details = f"📋 Workflow details - Original ID: {original_id}, Original Name: {original_name}"
         logger.info(workflow_details)
-        print(workflow_details)
         
-        if "drawflow" in data:
+        if isinstance(data["drawflow"], dict):
             node_count = len(data["drawflow"].get("Home", {}).get("data", {}))
             logger.info(f"📊 Workflow contains {node_count} nodes")
-            print(f"📊 Workflow contains {node_count} nodes")
         
     except json.JSONDecodeError as e:
         error_msg = f"❌ Invalid JSON in {WORKFLOW_FILE}: {e}"
         logger.error(error_msg)
-        print(error_msg)
     except Exception as e:
         error_msg = f"❌ Failed to parse {WORKFLOW_FILE}: {e}"
         logger.error(error_msg)
-        print(error_msg)
     
     return workflows
 
+def _recv_responses(ws, message_ids, linger_ids=frozenset()):
+    """Read frames until a response has arrived for every id in ``message_ids``
+
+    Responses for ``linger_ids`` are only picked up if they arrive within
+    REPLY_LINGER_TIMEOUT of the last required one; they are never waited on.
+    """
+    import websocket
+    
+    wanted = set(message_ids) | set(linger_ids)
+    responses = {}
+    while not set(message_ids) <= responses.keys():
+        frame = json_loads(ws.recv())
+        if frame.get("id") in wanted:
+            responses[frame["id"]] = frame
+    
+    previous_timeout = ws.gettimeout()
+    ws.settimeout(REPLY_LINGER_TIMEOUT)
+    try:
+        while not wanted <= responses.keys():
+            frame = json_loads(ws.recv())
+            if frame.get("id") in wanted:
+                responses[frame["id"]] = frame
+    except websocket.WebSocketTimeoutException:
+        pass
+    finally:
+        ws.settimeout(previous_timeout)
+    return responses
+
+def _get_global_object_id(ws):
+    """Return the remote object id of the target's global object"""
+    ws.send(json_dumps({
+        "id": 2,
+        "method": "Runtime.evaluate",
+        "params": {"expression": "globalThis", "returnByValue": False}
+    }))
+    response = _recv_responses(ws, {2})[2]
+    object_id = response.get("result", {}).get("result", {}).get("objectId")
+    if not object_id:
+        raise RuntimeError(f"Could not resolve the global object: {response}")
+    return object_id
+
 def inject_workflows_via_websocket(ws_url, workflows):
     """Inject workflows using WebSocket connection into chrome.storage.local only"""
+    import websocket
+    
     logger.info(f"🔗 Attempting WebSocket connection to: {ws_url[:50]}...")
-    print(f"🔗 Connecting via WebSocket...")
     
     try:
         # Establish WebSocket connection
         logger.debug("Creating WebSocket connection...")
-        ws = websocket.create_connection(ws_url)
+        # The timeout covers the handshake and every later recv(), so an
+        # unresponsive target fails instead of blocking forever
+        ws = websocket.create_connection(ws_url, timeout=WS_TIMEOUT, **WS_OPTIONS)
         logger.info("✅ WebSocket connection established")
-        print("✅ WebSocket connected")
         
         # Prepare workflows data
         workflows_data = {w["id"]: w for w in workflows}
         logger.info(f"📦 Preparing to upload {len(workflows)} workflow(s)")
-        print(f"📦 Preparing {len(workflows)} workflow(s) for upload...")
         
-        # Create storage injection script
-        storage_method = f"""
-        if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {{
-            chrome.storage.local.set({{workflows: {json.dumps(workflows_data)}}}, () => {{
-                console.log('Workflows saved to chrome.storage.local');
-            }});
-            'chrome_storage_done';
-        }} else {{
-            'chrome_storage_unavailable';
-        }}
-        """
+        # The workflows travel as a CDP call argument, which Chrome deserializes
+        # as JSON instead of parsing them as part of a JS source string
+        global_object_id = _get_global_object_id(ws)
+        message = {
+            "id": 1,
+            "method": "Runtime.callFunctionOn",
+            "params": {
+                "functionDeclaration": STORAGE_FUNCTION,
+                "objectId": global_object_id,
+                "arguments": [{"value": workflows_data}],
+                "returnByValue": True,
+                "awaitPromise": True
+            }
+        }
+        # Reload the page through CDP rather than a delayed location.reload()
+        refresh_msg = {
+            "id": 99,
+            "method": "Page.reload",
+            "params": {"ignoreCache": False}
+        }
+        
+        logger.info("📤 Sending storage injection command...")
         
-        logger.debug("📤 Sending storage injection command...")
-        print("📤 Injecting workflows into Chrome storage...")
+        # Encoded straight to UTF-8 text frames, skipping the str round trip
+        frames = (_dumps_bytes(message), _dumps_bytes(refresh_msg))
         
+        write_finished = False
         try:
-            message = {
-                "id": 1,
-                "method": "Runtime.evaluate",
-                "params": {"expression": storage_method}
-            }
-            ws.send(json.dumps(message))
-            logger.debug("✅ Storage command sent, waiting for response...")
+            ws.send(frames[0], websocket.ABNF.OPCODE_TEXT)
+            logger.debug("✅ Storage command sent, waiting for the write to finish...")
             
-            result = json.loads(ws.recv())
+            # The reply only arrives once the storage.set callback has run
+            result = _recv_responses(ws, {1})[1]
+            write_finished = True
             logger.debug(f"📥 Received response: {result}")
             
-            if "result" in result and "result" in result["result"]:
+            if "exceptionDetails" in result.get("result", {}):
+                # The promise was rejected from the storage.set callback
+                details = result["result"]["exceptionDetails"]
+                reason = details.get("exception", {}).get("description") or details.get("text")
+                logger.error(f"❌ chrome.storage.local.set failed: {reason}")
+            elif "result" in result and "result" in result["result"]:
                 result_value = result["result"]["result"].get("value", "")
                 if "chrome_storage_done" in result_value:
                     success_msg = "✅ Workflows successfully saved to chrome.storage.local"
                     logger.info(success_msg)
-                    print(success_msg)
                 elif "chrome_storage_unavailable" in result_value:
                     error_msg = "❌ Chrome storage API not available in this context"
                     logger.error(error_msg)
-                    print(error_msg)
                 else:
                     warning_msg = f"⚠️ Storage method executed but returned unexpected result: {result_value}"
                     logger.warning(warning_msg)
-                    print(warning_msg)
             else:
                 error_result = f"⚠️ Storage method had issues: {result}"
                 logger.warning(error_result)
-                print(error_result)
                 
+        except websocket.WebSocketTimeoutException:
+            logger.error(f"❌ No reply to the storage write within {WS_TIMEOUT}s - is the extension context awake?")
         except Exception as e:
             error_msg = f"❌ Storage injection failed: {e}"
             logger.error(error_msg)
-            print(error_msg)
-        
-        # Attempt to refresh the page
-        logger.info("🔄 Attempting to refresh the extension page...")
-        print("🔄 Refreshing extension page...")
         
-        refresh_script = """
-        if (typeof window.location !== 'undefined' && window.location.reload) {
-            setTimeout(() => window.location.reload(), 1000);
-        }
-        'refresh_attempted';
-        """
-        
-        refresh_msg = {
-            "id": 99,
-            "method": "Runtime.evaluate", 
-            "params": {"expression": refresh_script}
-        }
-        ws.send(json.dumps(refresh_msg))
-        refresh_result = ws.recv()
-        logger.debug(f"📥 Refresh command result: {refresh_result}")
+        if write_finished:
+            # Reload only after the write is persisted; the reply is not required
+            ws.send(frames[1], websocket.ABNF.OPCODE_TEXT)
+            logger.info("🔄 Extension page refresh requested")
+            refresh_result = _recv_responses(ws, (), linger_ids={99}).get(99, {})
+            logger.debug(f"📥 Refresh command result: {refresh_result}")
+            if "error" in refresh_result:
+                # Service-worker targets have no Page domain; reload the extension instead.
+                # The socket goes away with it, so the response is not awaited.
+                logger.info("🔄 Page.reload unavailable, reloading the extension runtime")
+                ws.send(json_dumps({
+                    "id": 100,
+                    "method": "Runtime.evaluate",
+                    "params": {"expression": "chrome.runtime && chrome.runtime.reload && chrome.runtime.reload()"}
+                }))
+        else:
+            # The write may still be pending, and a reload now could cut it off
+            logger.warning("⚠️ Skipping the extension page refresh")
         
         # Close WebSocket connection
         ws.close()
@@ -302,24 +453,23 @@ def inject_workflows_via_websocket(ws_url, workflows):
         
         final_msg = f"✅ Upload process completed for {len(workflows)} workflow(s)"
         logger.info(final_msg)
-        print(final_msg)
         
+    except websocket.WebSocketTimeoutException:
+        logger.error(f"❌ Chrome did not respond within {WS_TIMEOUT}s")
     except websocket.WebSocketException as e:
         error_msg = f"❌ WebSocket error: {e}"
         logger.error(error_msg)
-        print(error_msg)
     except Exception as e:
         error_msg = f"❌ Failed to inject workflows: {e}"
         logger.error(error_msg)
-        print(error_msg)
 
-def open_automa_extension():
+def open_automa_extension(tabs=None):
     """Try to open Automa extension in a new tab"""
     logger.info("🚀 Attempting to open Automa extension...")
-    print("🚀 Trying to open Automa extension...")
     
     try:
-        tabs = get_chrome_tabs()
+        if tabs is None:
+            tabs = get_chrome_tabs()
         extension_id = None
         
         # Try to find extension ID from existing tabs
@@ -333,7 +483,6 @@ def open_automa_extension():
         
         if not extension_id:
             logger.warning("⚠️ Could not determine extension ID, using generic approach")
-            print("⚠️ Extension ID not found, trying generic Chrome extensions page")
             extension_url = "chrome://extensions/"
         else:
             extension_url = f"chrome-extension://{extension_id}/src/newtab/index.html"
@@ -341,12 +490,11 @@ def open_automa_extension():
         
         # Open new tab
         logger.debug(f"📤 Creating new tab with URL: {extension_url}")
-        response = requests.get(f"{CHROME_DEBUG_URL}/new?{urllib.parse.quote(extension_url)}")
+        response = get_session().get(f"{CHROME_DEBUG_URL}/new?{urllib.parse.quote(extension_url)}")
         new_tab = response.json()
         
         success_msg = f"✅ Opened Automa extension in new tab"
         logger.info(success_msg)
-        print(success_msg)
         
         debugger_url = new_tab.get('webSocketDebuggerUrl')
         logger.info(f"🔗 New tab debugger URL: {debugger_url}")
@@ -356,7 +504,6 @@ def open_automa_extension():
     except Exception as e:
         error_msg = f"❌ Failed to open Automa extension: {e}"
         logger.error(error_msg)
-        print(error_msg)
         return None
 
 def print_completion_summary():
@@ -388,7 +535,7 @@ def main():
     logger.info("STARTING AUTOMA WORKFLOW UPLOAD PROCESS")
     logger.info("="*60)
     
-    print("🔄 Initializing workflow upload process...")
+    logger.info("🔄 Initializing workflow upload process...")
     logger.info(f"📁 Target workflow file: {WORKFLOW_FILE}")
     logger.info(f"🔗 Chrome DevTools URL: {CHROME_DEBUG_URL}")
     
@@ -397,21 +544,20 @@ def main():
     workflows = load_workflows()
     if not workflows:
         logger.error("❌ No workflows loaded, aborting process")
-        print("❌ No workflows to upload, process aborted")
         return
 
     # Step 2: Find or create Automa context
     logger.info("STEP 2: Finding Automa extension context")
-    debugger_url = find_automa_context()
+    tabs = get_chrome_tabs()
+    debugger_url = find_automa_context(tabs)
     
     if not debugger_url:
         logger.info("STEP 2b: No context found, attempting to create one")
-        print("⚠️ No Automa context found, trying to create one...")
-        debugger_url = open_automa_extension()
+        debugger_url = open_automa_extension(tabs)
         
         if not debugger_url:
             logger.info("STEP 2c: Still no context, using fallback method")
-            print("⚠️ Still no context, trying with any available tab...")
+            # Refetched, since open_automa_extension() may have opened a tab
             tabs = get_chrome_tabs()
             if tabs:
                 debugger_url = tabs[0].get('webSocketDebuggerUrl')
@@ -420,12 +566,11 @@ def main():
     if not debugger_url:
         error_msg = "❌ Could not establish connection to Chrome - process aborted"
         logger.error(error_msg)
-        print(error_msg)
         return
 
     # Step 3: Upload workflows
     logger.info("STEP 3: Uploading workflows via WebSocket")
-    print(f"🔗 Using connection: {debugger_url[:50]}...")
+    logger.info(f"🔗 Using connection: {debugger_url[:50]}...")
     inject_workflows_via_websocket(debugger_url, workflows)
     
     # Calculate execution time
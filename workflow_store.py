@@ -5,17 +5,42 @@ Extracts workflows from Chrome storage and exports them to CSV format
 """
 
 import os
-import json
 import csv
 import time
 import requests
 import websocket
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from requests.adapters import HTTPAdapter
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
+from json_utils import json_dumps, json_loads, json_size, write_json
 
 # Configuration
 CHROME_DEBUG_URL = "http://localhost:9222/json"
 OUTPUT_DIR = "/workspace/exports"
+OUTPUT_BUFFER_SIZE = 1024 * 1024  # write buffer for export files
+AUTOMA_CONTEXT_LABELS = {3: "background page", 2: "extension page", 1: "page"}
+WORKFLOW_CSV_FIELDS = (
+    'workflow_id', 'name', 'description', 'created_at', 'updated_at',
+    'is_disabled', 'version', 'category', 'author', 'website',
+    'node_count', 'connection_count', 'node_types', 'complexity_score',
+    'raw_json_size', 'has_settings', 'has_trigger'
+)
+
+# Shared keep-alive session for DevTools HTTP requests. They all go to the
+# one DevTools host, so a single connection pool is enough
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+def _format_timestamp(value: Any) -> Any:
+    """Format a millisecond epoch timestamp as local time, leaving other values untouched"""
+    # Decoded JSON timestamps are usually ints already; only strings need parsing
+    if isinstance(value, int) and not isinstance(value, bool):
+        if value <= 0:
+            return value
+    elif not (isinstance(value, str) and value.isdigit()):
+        return value
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(value) // 1000))
 
 def print_banner():
     """Print startup banner"""
@@ -28,7 +53,7 @@ def get_chrome_tabs() -> List[Dict]:
     """Get all Chrome tabs"""
     try:
         print("🔍 Connecting to Chrome DevTools...")
-        response = requests.get(CHROME_DEBUG_URL, timeout=10)
+        response = SESSION.get(CHROME_DEBUG_URL, timeout=(1, 5))
         if response.status_code == 200:
             tabs = response.json()
             print(f"✅ Found {len(tabs)} Chrome contexts")
@@ -36,7 +61,7 @@ def get_chrome_tabs() -> List[Dict]:
         else:
             print(f"❌ Chrome DevTools error: {response.status_code}")
             return []
-    except requests.exceptions.ConnectError:
+    except requests.exceptions.ConnectionError:
         print("❌ Cannot connect to Chrome - Is it running with --remote-debugging-port=9222?")
         return []
     except Exception as e:
@@ -58,48 +83,83 @@ def find_automa_context() -> Optional[str]:
         tab_type = tab.get('type', 'Unknown')
         print(f"  {i+1}. [{tab_type}] {title}")
     
-    # Find Automa contexts
-    for tab in tabs:
-        # Background page
-        if (tab.get('type') == 'background_page' and 
-            'automa' in tab.get('title', '').lower()):
-            print("✅ Found Automa background page")
-            return tab.get('webSocketDebuggerUrl')
-    
-    # Extension pages
+    # Single pass; the first tab at the highest priority wins:
+    # 3 = background page, 2 = extension page, 1 = Automa in title
+    best_tab, best_priority = None, 0
     for tab in tabs:
+        title = tab.get('title', '').lower()
         url = tab.get('url', '').lower()
-        if 'chrome-extension' in url and 'automa' in url:
-            print("✅ Found Automa extension page")
-            return tab.get('webSocketDebuggerUrl')
+        if tab.get('type') == 'background_page' and 'automa' in title:
+            best_tab, best_priority = tab, 3
+            break
+        if best_priority < 2 and 'chrome-extension' in url and 'automa' in url:
+            best_tab, best_priority = tab, 2
+        elif best_priority < 1 and 'automa' in title:
+            best_tab, best_priority = tab, 1
     
-    # Any page with Automa
-    for tab in tabs:
-        if 'automa' in tab.get('title', '').lower():
-            print("✅ Found Automa page")
-            return tab.get('webSocketDebuggerUrl')
+    if best_tab is not None:
+        print(f"✅ Found Automa {AUTOMA_CONTEXT_LABELS[best_priority]}")
+        return best_tab.get('webSocketDebuggerUrl')
     
     print("⚠️ No Automa context found")
     return None
 
-def extract_workflows_from_storage(ws_url: str) -> Dict[str, Any]:
-    """Extract workflows from Chrome storage"""
+def extract_workflows_from_storage(ws_url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Extract workflows from Chrome storage
+
+    Returns ``(workflows, summaries)``; the per-workflow node summaries are
+    computed in the page so the CSV export can skip walking every node.
+    """
     print("📤 Extracting workflows from chrome.storage.local...")
     
     try:
         ws = websocket.create_connection(ws_url)
         print("✅ WebSocket connected")
         
-        # JavaScript to extract workflows
+        # JavaScript to extract workflows; summarize() mirrors summarize_workflow()
         extraction_script = """
         new Promise((resolve) => {
+            const isObject = (value) => value !== null && typeof value === 'object' && !Array.isArray(value);
+            const summarize = (workflow) => {
+                const drawflow = (workflow && workflow.drawflow) || {};
+                const data = (drawflow.Home && drawflow.Home.data) || {};
+                const nodes = Object.values(data);
+                const nodeTypes = new Set();
+                let connectionCount = 0;
+                let hasTrigger = false;
+                for (const node of nodes) {
+                    if (isObject(node)) {
+                        const nodeName = 'name' in node ? node.name : 'unknown';
+                        nodeTypes.add(nodeName);
+                        if (!hasTrigger && typeof nodeName === 'string' && nodeName.toLowerCase().includes('trigger')) {
+                            hasTrigger = true;
+                        }
+                        for (const output of Object.values(node.outputs || {})) {
+                            if (isObject(output)) {
+                                connectionCount += (output.connections || []).length || 0;
+                            }
+                        }
+                    }
+                }
+                return {
+                    node_count: nodes.length,
+                    connection_count: connectionCount,
+                    node_types: [...nodeTypes].slice(0, 5),
+                    has_trigger: hasTrigger
+                };
+            };
             if (typeof chrome !== 'undefined' && chrome.storage && chrome.storage.local) {
                 chrome.storage.local.get(['workflows'], (result) => {
                     const workflows = result.workflows || {};
+                    const summaries = {};
+                    for (const [id, workflow] of Object.entries(workflows)) {
+                        summaries[id] = summarize(workflow);
+                    }
                     resolve({
                         success: true,
                         count: Object.keys(workflows).length,
                         workflows: workflows,
+                        summaries: summaries,
                         timestamp: Date.now()
                     });
                 });
@@ -124,8 +184,8 @@ def extract_workflows_from_storage(ws_url: str) -> Dict[str, Any]:
             }
         }
         
-        ws.send(json.dumps(message))
-        response = json.loads(ws.recv())
+        ws.send(json_dumps(message))
+        response = json_loads(ws.recv())
         ws.close()
         
         if "result" in response and "result" in response["result"]:
@@ -133,17 +193,48 @@ def extract_workflows_from_storage(ws_url: str) -> Dict[str, Any]:
             if result_data.get("success"):
                 count = result_data.get("count", 0)
                 print(f"✅ Successfully extracted {count} workflows")
-                return result_data.get("workflows", {})
+                return result_data.get("workflows", {}), result_data.get("summaries", {})
             else:
                 print(f"❌ Extraction failed: {result_data.get('error', 'Unknown error')}")
-                return {}
+                return {}, {}
         else:
             print("❌ Invalid response from Chrome")
-            return {}
+            return {}, {}
             
     except Exception as e:
         print(f"❌ Extraction failed: {e}")
-        return {}
+        return {}, {}
+
+def summarize_workflow(workflow: Dict[str, Any]) -> Dict[str, Any]:
+    """Count nodes, connections and node types of one workflow
+
+    Fallback for workflows without a summary from the extraction script.
+    """
+    data = workflow.get('drawflow', {}).get('Home', {}).get('data', {})
+    connection_count = 0
+    node_types = {}  # insertion-ordered set of node names
+    has_trigger = False
+    
+    for node in data.values():
+        if isinstance(node, dict):
+            node_name = node.get('name', 'unknown')
+            node_types[node_name] = None
+            if not has_trigger and isinstance(node_name, str) and 'trigger' in node_name.lower():
+                has_trigger = True
+            
+            # Count outputs (connections)
+            outputs = node.get('outputs', {})
+            for output_data in outputs.values():
+                if isinstance(output_data, dict):
+                    connections = output_data.get('connections', [])
+                    connection_count += len(connections)
+    
+    return {
+        'node_count': len(data),
+        'connection_count': connection_count,
+        'node_types': list(islice(node_types, 5)),
+        'has_trigger': has_trigger,
+    }
 
 def analyze_workflow_structure(workflows: Dict[str, Any]) -> Dict[str, set]:
     """Analyze workflow structure to determine CSV columns"""
@@ -159,9 +250,10 @@ def analyze_workflow_structure(workflows: Dict[str, Any]) -> Dict[str, set]:
                 all_fields.add(key)
         
         # Analyze nodes in drawflow
-        if 'drawflow' in workflow and 'Home' in workflow['drawflow']:
-            data = workflow['drawflow']['Home'].get('data', {})
-            for node_id, node in data.items():
+        drawflow = workflow.get('drawflow', {})
+        if 'Home' in drawflow:
+            data = drawflow['Home'].get('data', {})
+            for node in data.values():
                 if isinstance(node, dict):
                     for node_key in node.keys():
                         node_fields.add(f"node_{node_key}")
@@ -169,8 +261,41 @@ def analyze_workflow_structure(workflows: Dict[str, Any]) -> Dict[str, set]:
     print(f"📋 Found {len(all_fields)} workflow fields and {len(node_fields)} node fields")
     return {"workflow": all_fields, "nodes": node_fields}
 
-def export_workflows_to_csv(workflows: Dict[str, Any], output_path: str) -> bool:
-    """Export workflows to CSV file"""
+def build_workflow_row(workflow_id: str, workflow: Dict[str, Any],
+                       summary: Optional[Dict[str, Any]] = None) -> Tuple:
+    """Build the CSV row for one workflow, in WORKFLOW_CSV_FIELDS order"""
+    if summary is None:
+        summary = summarize_workflow(workflow)
+    node_count = summary['node_count']
+    connection_count = summary['connection_count']
+    
+    return (
+        workflow_id,
+        workflow.get('name', 'Unnamed'),
+        workflow.get('description', ''),
+        _format_timestamp(workflow.get('createdAt', '')),
+        _format_timestamp(workflow.get('updatedAt', '')),
+        workflow.get('isDisabled', False),
+        workflow.get('version', ''),
+        workflow.get('category', ''),
+        workflow.get('author', ''),
+        workflow.get('website', ''),
+        node_count,
+        connection_count,
+        ', '.join(summary['node_types']),  # First 5 node types
+        node_count + connection_count,  # complexity score
+        json_size(workflow),  # raw JSON size, for advanced users
+        'settings' in workflow,
+        summary['has_trigger'],
+    )
+
+def export_workflows_to_csv(workflows: Dict[str, Any], output_path: str,
+                            summaries: Optional[Dict[str, Any]] = None) -> bool:
+    """Export workflows to CSV file
+
+    ``summaries`` maps workflow ids to precomputed node summaries (see
+    ``extract_workflows_from_storage``); missing ones are computed here.
+    """
     print(f"💾 Exporting workflows to CSV: {output_path}")
     
     if not workflows:
@@ -178,78 +303,17 @@ def export_workflows_to_csv(workflows: Dict[str, Any], output_path: str) -> bool
         return False
     
     try:
-        # Prepare CSV data
-        csv_rows = []
-        
-        for workflow_id, workflow in workflows.items():
-            row = {
-                'workflow_id': workflow_id,
-                'name': workflow.get('name', 'Unnamed'),
-                'description': workflow.get('description', ''),
-                'created_at': workflow.get('createdAt', ''),
-                'updated_at': workflow.get('updatedAt', ''),
-                'is_disabled': workflow.get('isDisabled', False),
-                'version': workflow.get('version', ''),
-                'category': workflow.get('category', ''),
-                'author': workflow.get('author', ''),
-                'website': workflow.get('website', ''),
-            }
-            
-            # Convert timestamps to readable format
-            for time_field in ['created_at', 'updated_at']:
-                if row[time_field] and str(row[time_field]).isdigit():
-                    timestamp = int(row[time_field]) / 1000
-                    row[time_field] = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Count nodes and connections
-            node_count = 0
-            connection_count = 0
-            node_types = []
+        # Rows are written as they are built rather than collected first
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(WORKFLOW_CSV_FIELDS)
             
-            if 'drawflow' in workflow and 'Home' in workflow['drawflow']:
-                data = workflow['drawflow']['Home'].get('data', {})
-                node_count = len(data)
-                
-                for node_id, node in data.items():
-                    if isinstance(node, dict):
-                        node_name = node.get('name', 'unknown')
-                        if node_name not in node_types:
-                            node_types.append(node_name)
-                        
-                        # Count outputs (connections)
-                        outputs = node.get('outputs', {})
-                        for output_key, output_data in outputs.items():
-                            if isinstance(output_data, dict):
-                                connections = output_data.get('connections', [])
-                                connection_count += len(connections)
-            
-            row.update({
-                'node_count': node_count,
-                'connection_count': connection_count,
-                'node_types': ', '.join(node_types[:5]),  # First 5 node types
-                'complexity_score': node_count + connection_count,
-            })
-            
-            # Add raw JSON for advanced users
-            row['raw_json_size'] = len(json.dumps(workflow))
-            row['has_settings'] = 'settings' in workflow
-            row['has_trigger'] = any('trigger' in str(node).lower() for node in workflow.get('drawflow', {}).get('Home', {}).get('data', {}).values())
-            
-            csv_rows.append(row)
+            for workflow_id, workflow in workflows.items():
+                summary = summaries.get(workflow_id) if summaries else None
+                writer.writerow(build_workflow_row(workflow_id, workflow, summary))
         
-        # Write CSV
-        if csv_rows:
-            fieldnames = csv_rows[0].keys()
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(csv_rows)
-            
-            print(f"✅ Successfully exported {len(csv_rows)} workflows to CSV")
-            return True
-        else:
-            print("❌ No data to write to CSV")
-            return False
+        print(f"✅ Successfully exported {len(workflows)} workflows to CSV")
+        return True
             
     except Exception as e:
         print(f"❌ CSV export failed: {e}")
@@ -267,8 +331,7 @@ def export_detailed_workflows_json(workflows: Dict[str, Any], output_path: str)
             'workflows': workflows
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        write_json(output_path, export_data)
         
         print(f"✅ JSON backup exported successfully")
         return True
@@ -293,7 +356,7 @@ def main():
         return
     
     # Extract workflows
-    workflows = extract_workflows_from_storage(ws_url)
+    workflows, summaries = extract_workflows_from_storage(ws_url)
     if not workflows:
         print("❌ No workflows found or extraction failed")
         return
@@ -302,7 +365,7 @@ def main():
     
     # Export to CSV
     csv_path = os.path.join(OUTPUT_DIR, f"automa_workflows_{timestamp}.csv")
-    csv_success = export_workflows_to_csv(workflows, csv_path)
+    csv_success = export_workflows_to_csv(workflows, csv_path, summaries)
     
     # Export detailed JSON backup
     json_path = os.path.join(OUTPUT_DIR, f"automa_workflows_backup_{timestamp}.json")